@@ -0,0 +1,51 @@
+"""add_feature_listing_index
+
+Revision ID: add_feature_listing_index_001
+Revises: feasibility_ts_default_001
+Create Date: 2026-10-15 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_feature_listing_index_001'
+down_revision: Union[str, Sequence[str], None] = 'feasibility_ts_default_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'ix_project_features_project_id_discovery_timestamp'
+TABLE = 'project_features'
+
+
+def upgrade() -> None:
+    """Upgrade schema - add a (project_id, discovery_timestamp) index for per-project feature listings."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    
+    if TABLE not in inspector.get_table_names():
+        print(f"Table '{TABLE}' does not exist, skipping index '{INDEX_NAME}'")
+        return
+    if INDEX_NAME in {index['name'] for index in inspector.get_indexes(TABLE)}:
+        print(f"Index '{INDEX_NAME}' already exists, skipping")
+        return
+    
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; other dialects ignore the flag
+    with op.get_context().autocommit_block():
+        op.create_index(INDEX_NAME, TABLE, ['project_id', 'discovery_timestamp'], unique=False, postgresql_concurrently=True)
+    print(f"Created index '{INDEX_NAME}' on {TABLE}")
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop the feature listing index."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    
+    if TABLE not in inspector.get_table_names():
+        return
+    if INDEX_NAME in {index['name'] for index in inspector.get_indexes(TABLE)}:
+        with op.get_context().autocommit_block():
+            op.drop_index(INDEX_NAME, table_name=TABLE, postgresql_concurrently=True)
+        print(f"Dropped index '{INDEX_NAME}' from {TABLE}")
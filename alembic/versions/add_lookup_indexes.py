@@ -0,0 +1,62 @@
+"""add_lookup_indexes
+
+Revision ID: add_lookup_indexes_001
+Revises: add_project_summary_001
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_lookup_indexes_001'
+down_revision: Union[str, Sequence[str], None] = 'add_project_summary_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_chats_project_id', 'chats', ['project_id']),
+    ('ix_chats_recipe_id', 'chats', ['recipe_id']),
+    ('ix_recipes_project_id', 'recipes', ['project_id']),
+    ('ix_feasibilities_project_id_analysis_timestamp', 'feasibilities', ['project_id', 'analysis_timestamp']),
+]
+
+
+def _existing_indexes(inspector, table: str) -> set:
+    """Names of the indexes already present on a table (as a set for O(1) membership checks)."""
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema - add indexes on the foreign keys used for per-project lookups."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = set(inspector.get_table_names())
+    
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; other dialects ignore the flag
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            if table not in tables:
+                print(f"Table '{table}' does not exist, skipping index '{name}'")
+                continue
+            if name in _existing_indexes(inspector, table):
+                print(f"Index '{name}' already exists, skipping")
+                continue
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+            print(f"Created index '{name}' on {table}")
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop the lookup indexes."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = set(inspector.get_table_names())
+    
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            if table in tables and name in _existing_indexes(inspector, table):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
+                print(f"Dropped index '{name}' from {table}")
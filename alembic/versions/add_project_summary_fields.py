@@ -25,8 +25,8 @@ def upgrade() -> None:
     bind = op.get_bind()
     inspector = inspect(bind)
     
-    # Get the projects table columns
-    projects_columns = [col['name'] for col in inspector.get_columns('projects')]
+    # Get the projects table columns (as a set for O(1) membership checks)
+    projects_columns = {col['name'] for col in inspector.get_columns('projects')}
     
     # Add project_name column if it doesn't exist
     if 'project_name' not in projects_columns:
@@ -62,7 +62,7 @@ def downgrade() -> None:
     # Check if columns exist before dropping
     bind = op.get_bind()
     inspector = inspect(bind)
-    projects_columns = [col['name'] for col in inspector.get_columns('projects')]
+    projects_columns = {col['name'] for col in inspector.get_columns('projects')}
     
     # Drop columns if they exist
     if 'tech_stack' in projects_columns:
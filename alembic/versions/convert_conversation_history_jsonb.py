@@ -0,0 +1,75 @@
+"""convert_conversation_history_jsonb
+
+Revision ID: conversation_history_jsonb_001
+Revises: add_lookup_indexes_001
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = 'conversation_history_jsonb_001'
+down_revision: Union[str, Sequence[str], None] = 'add_lookup_indexes_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _conversation_history_type(inspector):
+    """Current type of chats.conversation_history, or None if the column is missing."""
+    for col in inspector.get_columns('chats'):
+        if col['name'] == 'conversation_history':
+            return col['type']
+    return None
+
+
+def upgrade() -> None:
+    """Upgrade schema - store chats.conversation_history as JSONB instead of a JSON string in TEXT."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    
+    column_type = _conversation_history_type(inspector)
+    if column_type is None:
+        print("Column 'conversation_history' does not exist, skipping")
+        return
+    if isinstance(column_type, postgresql.JSONB):
+        print("Column 'conversation_history' is already JSONB, skipping")
+        return
+    
+    # Empty strings are not valid JSON; normalise them before the cast
+    op.execute("UPDATE chats SET conversation_history = '[]' WHERE conversation_history IS NULL OR conversation_history = ''")
+    op.alter_column(
+        'chats',
+        'conversation_history',
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        existing_type=sa.Text(),
+        existing_nullable=True,
+        server_default=sa.text("'[]'::jsonb"),
+        postgresql_using='conversation_history::jsonb'
+    )
+    print("Converted 'conversation_history' column to JSONB")
+
+
+def downgrade() -> None:
+    """Downgrade schema - store chats.conversation_history as TEXT again."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    
+    column_type = _conversation_history_type(inspector)
+    if not isinstance(column_type, postgresql.JSONB):
+        return
+    
+    op.alter_column(
+        'chats',
+        'conversation_history',
+        type_=sa.Text(),
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        existing_nullable=True,
+        server_default=None,
+        postgresql_using='conversation_history::text'
+    )
+    print("Converted 'conversation_history' column back to TEXT")
@@ -0,0 +1,70 @@
+"""drop_recipes_table
+
+Revision ID: drop_recipes_001
+Revises: conversation_history_jsonb_001
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = 'drop_recipes_001'
+down_revision: Union[str, Sequence[str], None] = 'conversation_history_jsonb_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - drop the deprecated recipes table and chats.recipe_id."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = set(inspector.get_table_names())
+    
+    if 'chats' in tables:
+        chats_columns = {col['name'] for col in inspector.get_columns('chats')}
+        if 'recipe_id' in chats_columns:
+            # Drop the FK first; its name depends on how the table was created
+            for fk in inspector.get_foreign_keys('chats'):
+                if fk['referred_table'] == 'recipes' and fk.get('name'):
+                    op.drop_constraint(fk['name'], 'chats', type_='foreignkey')
+            op.drop_column('chats', 'recipe_id')
+            print("Dropped 'recipe_id' column from chats table")
+        else:
+            print("Column 'recipe_id' does not exist, skipping")
+    
+    if 'recipes' in tables:
+        op.drop_table('recipes')
+        print("Dropped 'recipes' table")
+    else:
+        print("Table 'recipes' does not exist, skipping")
+
+
+def downgrade() -> None:
+    """Downgrade schema - recreate the recipes table and chats.recipe_id."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    tables = set(inspector.get_table_names())
+    
+    if 'recipes' not in tables:
+        op.create_table('recipes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.String(length=255), nullable=False),
+        sa.Column('recipe_name', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.project_id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_recipes_id'), 'recipes', ['id'], unique=False)
+        op.create_index(op.f('ix_recipes_project_id'), 'recipes', ['project_id'], unique=False)
+    
+    chats_columns = {col['name'] for col in inspector.get_columns('chats')}
+    if 'recipe_id' not in chats_columns:
+        op.add_column('chats', sa.Column('recipe_id', sa.Integer(), nullable=True))
+        op.create_foreign_key('chats_recipe_id_fkey', 'chats', 'recipes', ['recipe_id'], ['id'])
+        op.create_index(op.f('ix_chats_recipe_id'), 'chats', ['recipe_id'], unique=False)
@@ -0,0 +1,54 @@
+"""feasibility_timestamp_server_default
+
+Revision ID: feasibility_ts_default_001
+Revises: drop_recipes_001
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+# revision identifiers, used by Alembic.
+revision: str = 'feasibility_ts_default_001'
+down_revision: Union[str, Sequence[str], None] = 'drop_recipes_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - let the database stamp feasibilities.analysis_timestamp (UTC)."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    
+    if 'feasibilities' not in inspector.get_table_names():
+        print("Table 'feasibilities' does not exist, skipping")
+        return
+    
+    op.alter_column(
+        'feasibilities',
+        'analysis_timestamp',
+        existing_type=sa.DateTime(),
+        existing_nullable=False,
+        server_default=sa.text("timezone('utc', now())")
+    )
+    print("Added server default to 'analysis_timestamp'")
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop the analysis_timestamp server default."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    
+    if 'feasibilities' not in inspector.get_table_names():
+        return
+    
+    op.alter_column(
+        'feasibilities',
+        'analysis_timestamp',
+        existing_type=sa.DateTime(),
+        existing_nullable=False,
+        server_default=None
+    )
@@ -28,6 +28,15 @@ DATABASE_URL = os.getenv(
     "postgresql://yml@localhost:5432/product_assistant"
 )
 
+# Connection pool sizing (ignored for SQLite); connections are pinged before use
+# and recycled before server/pooler idle timeouts can drop them
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "300"))
+# Create missing tables when the app boots (one existence check per table, per worker);
+# set false when the schema is managed by init_db.py / Alembic at deploy time
+DB_CREATE_TABLES_ON_STARTUP = os.getenv("DB_CREATE_TABLES_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+
 # Gemini API Configuration
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
@@ -37,12 +46,49 @@ GEMINI_FALLBACK_MODEL = os.getenv("GEMINI_FALLBACK_MODEL", "gemini-2.5-pro")
 CODEX_AUTH_JSON = os.getenv("CODEX_AUTH_JSON", "")
 CODEX_MODEL = os.getenv("CODEX_MODEL", "gpt-5-codex")
 CODEX_FALLBACK_MODEL = os.getenv("CODEX_FALLBACK_MODEL", "gpt-5")
+# Wall-clock limit for a single Codex run; the process is killed when exceeded
+CODEX_TIMEOUT_SECONDS = int(os.getenv("CODEX_TIMEOUT_SECONDS", "180"))
+# Codex processes allowed to run at once across the whole app; further runs wait for a slot
+CODEX_MAX_CONCURRENCY = int(os.getenv("CODEX_MAX_CONCURRENCY", "8"))
+# Capabilities analysed concurrently during feature discovery (each runs Codex + one Gemini call)
+FEATURE_DISCOVERY_CONCURRENCY = int(os.getenv("FEATURE_DISCOVERY_CONCURRENCY", "4"))
+# Project summary: skip the Codex overview when a README with at least this many
+# non-whitespace characters (of the first 2000 read) is found
+SUMMARY_SKIP_CODEX_WITH_README = os.getenv("SUMMARY_SKIP_CODEX_WITH_README", "false").lower() in ("1", "true", "yes")
+SUMMARY_README_MIN_CHARS = int(os.getenv("SUMMARY_README_MIN_CHARS", "500"))
 
 # Git Configuration
 GIT_REPO_BASE_PATH = os.getenv("GIT_REPO_BASE_PATH", "/tmp/product-assistant-repos")
 GIT_BRANCH = os.getenv("GIT_BRANCH", "main")
+# Clone/fetch only the branch tip (analysis reads the working tree, not history); set false for full history
+GIT_SHALLOW = os.getenv("GIT_SHALLOW", "true").lower() in ("1", "true", "yes")
 
 # Conversation History Configuration
 # Maximum number of conversation messages to keep in history
 # This prevents context window overflow and maintains performance
 MAX_CONVERSATION_HISTORY_MESSAGES = int(os.getenv("MAX_CONVERSATION_HISTORY_MESSAGES", "20"))
+
+# Gemini Response Cache Configuration
+# Identical (system_prompt, prompt) pairs are served from a local SQLite cache
+GEMINI_CACHE_ENABLED = os.getenv("GEMINI_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+GEMINI_CACHE_PATH = os.getenv("GEMINI_CACHE_PATH", "/tmp/gemini_cache.sqlite3")
+GEMINI_CACHE_TTL_SECONDS = int(os.getenv("GEMINI_CACHE_TTL_SECONDS", "86400"))
+
+# In-process cache TTL for GET /projects and GET /projects/{project_id} responses and for
+# project existence checks on feature/feasibility reads (seconds, 0 disables)
+PROJECT_RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("PROJECT_RESPONSE_CACHE_TTL_SECONDS", "30"))
+
+# Responses at least this large (bytes) are gzip-compressed for clients that accept it
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+
+# Codex Analysis Cache Configuration
+# Results are keyed by repo HEAD commit + prompt + Codex version and stored as files
+CODEX_CACHE_ENABLED = os.getenv("CODEX_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CODEX_CACHE_DIR = os.getenv("CODEX_CACHE_DIR", "/tmp/product-assistant-cache/codex")
+CODEX_CACHE_TTL_SECONDS = int(os.getenv("CODEX_CACHE_TTL_SECONDS", "86400"))
+
+# LangGraph Checkpoint Configuration
+# Persists graph state per chat (or per project for standalone analyses) in SQLite so the
+# Codex analysis carries over between runs; requires langgraph-checkpoint-sqlite
+GRAPH_CHECKPOINT_ENABLED = os.getenv("GRAPH_CHECKPOINT_ENABLED", "false").lower() in ("1", "true", "yes")
+GRAPH_CHECKPOINT_PATH = os.getenv("GRAPH_CHECKPOINT_PATH", "/tmp/product-assistant-checkpoints.sqlite3")
@@ -4,12 +4,15 @@ Chat Node - Handles conversational responses with context and conversation histo
 
 import json
 import logging
+from collections import deque
 from app.langgraph.unified_state import UnifiedAgentState
-from app.services.gemini_client import GeminiClient
+from app.services.gemini_client import get_gemini_client
 from app.config import MAX_CONVERSATION_HISTORY_MESSAGES
 
 logger = logging.getLogger(__name__)
 
+_ROLE_LABELS = {"user": "Product Manager"}
+
 
 def create_chat_node() -> callable:
     """
@@ -18,18 +21,19 @@ def create_chat_node() -> callable:
     Returns:
         Node function for LangGraph
     """
-    gemini_client = GeminiClient()
-
-    def chat_node(state: UnifiedAgentState) -> UnifiedAgentState:
+    async def chat_node(state: UnifiedAgentState) -> UnifiedAgentState:
         """
         Chat agent that provides conversational responses with context.
         """
         try:
-            logger.info(f"Running Chat agent for chat_id {state.get('chat_id')}")
+            logger.info("Running Chat agent for chat_id %s", state.get('chat_id'))
             
             chat_id = state.get("chat_id")
             message = state.get("message", "")
-            conversation_history = state.get("conversation_history", [])
+            # Bounded copy: keeps the prompt size capped and evicts the oldest turns on append
+            conversation_history = deque(
+                state.get("conversation_history") or [], maxlen=MAX_CONVERSATION_HISTORY_MESSAGES
+            )
             analysis_context = state.get("analysis_context", "")
             
             # Build conversation context
@@ -37,54 +41,41 @@ def create_chat_node() -> callable:
 Write in business-friendly language. Focus on product impact, user experience, and business considerations. 
 Avoid technical jargon, code references, or file names. Be conversational and helpful."""
             
-            conversation_context = ""
+            parts = []
             if analysis_context:
-                conversation_context += f"Previous Analysis Context:\n{analysis_context}\n\n"
+                parts.append(f"Previous Analysis Context:\n{analysis_context}\n\n")
             
             if conversation_history:
-                # Truncate conversation history to prevent context window overflow
-                # Keep only the most recent messages
-                truncated_history = conversation_history[-MAX_CONVERSATION_HISTORY_MESSAGES:] if len(conversation_history) > MAX_CONVERSATION_HISTORY_MESSAGES else conversation_history
-                
-                if len(conversation_history) > MAX_CONVERSATION_HISTORY_MESSAGES:
-                    logger.warning(
-                        f"Truncated conversation history from {len(conversation_history)} to "
-                        f"{len(truncated_history)} messages in chat node"
-                    )
-                
-                conversation_context += "Conversation History:\n"
-                for msg in truncated_history:
-                    role_label = "Product Manager" if msg.get("role") == "user" else "Assistant"
-                    conversation_context += f"{role_label}: {msg.get('content', '')}\n\n"
+                parts.append("Conversation History:\n")
+                for msg in conversation_history:
+                    role_label = _ROLE_LABELS.get(msg.get("role"), "Assistant")
+                    parts.append(f"{role_label}: {msg.get('content', '')}\n\n")
             
-            conversation_context += f"Product Manager: {message}\n\nAssistant:"
+            parts.append(f"Product Manager: {message}\n\nAssistant:")
+            conversation_context = "".join(parts)
             
-            # Generate response
-            response_text = gemini_client.generate_content(
+            # Generate response (not cached: a repeated message should get a fresh reply)
+            response_text = await get_gemini_client().agenerate_content(
                 conversation_context,
                 system_prompt=system_prompt
             )
             
             # Add to conversation history
-            updated_history = conversation_history + [
-                {"role": "user", "content": message},
-                {"role": "assistant", "content": response_text}
-            ]
+            conversation_history.append({"role": "user", "content": message})
+            conversation_history.append({"role": "assistant", "content": response_text})
             
             return {
-                **state,
                 "response": response_text,
-                "conversation_history": updated_history,
-                "messages": state.get("messages", []) + ["Chat response generated"]
+                "conversation_history": conversation_history,
+                "messages": ["Chat response generated"]
             }
             
         except Exception as e:
-            logger.error(f"Error in Chat agent: {str(e)}", exc_info=True)
+            logger.error("Error in Chat agent: %s", e, exc_info=True)
             error_msg = f"Chat agent failed: {str(e)}"
             return {
-                **state,
                 "response": error_msg,
-                "messages": state.get("messages", []) + [error_msg]
+                "messages": [error_msg]
             }
     
     return chat_node
@@ -3,41 +3,43 @@ Feasibility Analysis Node
 Analyzes feasibility of a new requirement
 """
 
+import functools
 import logging
+import re
+from typing import Dict, List
 from app.langgraph.state import FeasibilityAnalysisState
-from app.services.gemini_client import GeminiClient
+from app.langgraph.tools.codex_section_parser import budget_truncate
+from app.services.gemini_cache import cached_agenerate
 
 logger = logging.getLogger(__name__)
 
+# Matches "## Heading" lines (but not "### Sub-heading")
+_HEADING_RE = re.compile(r"(?m)^##(?!#)[ \t]*")
 
-def create_feasibility_analysis_node() -> callable:
-    """
-    Create a Feasibility Analysis node function.
-    
-    Returns:
-        Node function for LangGraph
-    """
-    gemini_client = GeminiClient()
+# Whole-word High/Medium/Low, checked in that priority order in the Feasibility Assessment section
+_FEASIBILITY_LEVEL_RES = tuple(
+    (level, re.compile(rf"\b{level}\b", re.IGNORECASE)) for level in ("High", "Medium", "Low")
+)
+
+# Task breakdown keyword -> task_breakdown flag
+_TASK_KEYWORDS = {
+    "design": "design",
+    "spike": "spike",
+    "research": "spike",
+    "poc": "poc",
+    "proof of concept": "poc",
+    "implementation": "implementation",
+    "qa": "qa",
+    "testing": "qa",
+    "quality assurance": "qa",
+}
+_TASK_KEYWORD_RE = re.compile(
+    r"\b(" + "|".join(re.escape(k) for k in _TASK_KEYWORDS) + r")\b", re.IGNORECASE
+)
 
-    def feasibility_analysis_node(state: FeasibilityAnalysisState) -> FeasibilityAnalysisState:
-        """
-        Feasibility Analysis Agent.
-        Uses Codex CLI analysis output to assess feasibility of a new requirement.
-        """
-        try:
-            logger.info(f"Running Feasibility Analysis agent for project {state.get('project_id')}")
-            
-            codex_analysis = state.get("codex_analysis", "")
-            requirement = state.get("requirement", "")
-            context = state.get("context", "")
-            
-            analysis_snippet = (codex_analysis or "").strip()
-            if len(analysis_snippet) > 6000:
-                analysis_snippet = analysis_snippet[:6000] + "\n\n[Truncated: analysis exceeded 6000 characters]"
-            if not analysis_snippet:
-                analysis_snippet = "N/A"
 
-            prompt = f"""
+# Prompt template; only the three fields are substituted per call
+_FEASIBILITY_PROMPT_TMPL = """
 You are a product strategy advisor helping a product manager understand the feasibility of a new requirement.
 
 Task:
@@ -61,7 +63,7 @@ New Requirement:
 {requirement}
 
 Additional Context:
-{context or "None provided"}
+{context}
 
 Codex CLI Analysis:
 {analysis_snippet}
@@ -109,7 +111,70 @@ Provide rough estimates using DETERMINISTIC story point mapping:
 Note: Not all tasks are required. Only include tasks that are actually needed for this requirement.]
 """
 
-            formatted_analysis = gemini_client.generate_content(
+
+def _split_sections(text: str) -> Dict[str, str]:
+    """Split markdown text into {heading: body} in a single pass."""
+    sections = {}
+    for chunk in _HEADING_RE.split(text)[1:]:
+        heading, _, body = chunk.partition("\n")
+        sections.setdefault(heading.strip(), body.strip())
+    return sections
+
+
+def _find_section(sections: Dict[str, str], heading: str) -> str:
+    """Get a section body by exact heading, falling back to the first heading with that prefix."""
+    if heading in sections:
+        return sections[heading]
+    for key, body in sections.items():
+        if key.startswith(heading):
+            return body
+    return ""
+
+
+def _bullet_items(section: str) -> List[str]:
+    """Collect "- item" / "* item" bullet lines from a section (hyphens inside items are kept)."""
+    items = []
+    for line in section.splitlines():
+        stripped = line.lstrip()
+        if stripped[:2] in ("- ", "* "):
+            item = stripped[2:].strip()
+            if item:
+                items.append(item)
+    return items
+
+
+@functools.lru_cache(maxsize=1)
+def create_feasibility_analysis_node() -> callable:
+    """
+    Create a Feasibility Analysis node function.
+    
+    Returns:
+        Node function for LangGraph
+    """
+    async def feasibility_analysis_node(state: FeasibilityAnalysisState) -> FeasibilityAnalysisState:
+        """
+        Feasibility Analysis Agent.
+        Uses Codex CLI analysis output to assess feasibility of a new requirement.
+        """
+        try:
+            logger.info("Running Feasibility Analysis agent for project %s", state.get('project_id'))
+            
+            codex_analysis = state.get("codex_analysis", "")
+            requirement = state.get("requirement", "")
+            context = state.get("context", "")
+            
+            # Keep whole Codex sections (highest priority first) within the prompt budget
+            analysis_snippet = budget_truncate(codex_analysis or "", 6000)
+            if not analysis_snippet:
+                analysis_snippet = "N/A"
+
+            prompt = _FEASIBILITY_PROMPT_TMPL.format_map({
+                "requirement": requirement,
+                "context": context or "None provided",
+                "analysis_snippet": analysis_snippet,
+            })
+
+            formatted_analysis = await cached_agenerate(
                 prompt,
                 system_prompt="""You are a product strategy advisor helping product managers understand feature feasibility. 
 Write in business-friendly language. Focus on product impact, user experience, and business considerations. 
@@ -125,45 +190,37 @@ Avoid technical jargon, code references, or file names. Be thorough, realistic,
             technical_feasibility = "Unknown"
             high_level_design = formatted_analysis
             
-            # Simple parsing - extract sections
-            def _section(text: str, heading: str) -> str:
-                if heading not in text:
-                    return ""
-                return text.split(heading, 1)[1].split("##", 1)[0].strip()
+            # Split the response into sections once, then look each heading up
+            sections = _split_sections(formatted_analysis)
             
-            risks_section = _section(formatted_analysis, "## Risks & Challenges")
-            if not risks_section:
-                risks_section = _section(formatted_analysis, "## Risks")
+            risks_section = _find_section(sections, "Risks & Challenges") or _find_section(sections, "Risks")
             if risks_section:
-                risks = [r.strip() for r in risks_section.split("-") if r.strip() and not r.strip().startswith("#")]
+                risks = _bullet_items(risks_section)
             
-            questions_section = _section(formatted_analysis, "## Open Questions")
+            questions_section = _find_section(sections, "Open Questions")
             if questions_section:
-                open_questions = [q.strip() for q in questions_section.split("-") if q.strip() and not q.strip().startswith("#")]
+                open_questions = _bullet_items(questions_section)
             
-            feasibility_section = _section(formatted_analysis, "## Feasibility Assessment")
+            feasibility_section = _find_section(sections, "Feasibility Assessment")
             if feasibility_section:
-                lower_section = feasibility_section.lower()
-                if "high" in lower_section:
-                    technical_feasibility = "High"
-                elif "medium" in lower_section:
-                    technical_feasibility = "Medium"
-                elif "low" in lower_section:
-                    technical_feasibility = "Low"
+                for level, level_re in _FEASIBILITY_LEVEL_RES:
+                    if level_re.search(feasibility_section):
+                        technical_feasibility = level
+                        break
             
-            estimate_section = _section(formatted_analysis, "## Rough Estimate")
+            estimate_section = _find_section(sections, "Rough Estimate")
             if estimate_section:
                 rough_estimate = {
                     "raw_text": estimate_section.strip(),
                     "parsed": True
                 }
             
-            high_level_section = _section(formatted_analysis, "## High-Level Approach")
+            high_level_section = _find_section(sections, "High-Level Approach")
             if high_level_section:
                 high_level_design = high_level_section
             
             # Extract task breakdown
-            task_breakdown_section = _section(formatted_analysis, "## Task Breakdown")
+            task_breakdown_section = _find_section(sections, "Task Breakdown")
             if task_breakdown_section:
                 # Parse task breakdown - look for common task types
                 task_breakdown = {
@@ -171,17 +228,8 @@ Avoid technical jargon, code references, or file names. Be thorough, realistic,
                     "parsed": True
                 }
                 # Try to extract individual tasks
-                lower_section = task_breakdown_section.lower()
-                if "design" in lower_section:
-                    task_breakdown["design"] = True
-                if "spike" in lower_section or "research" in lower_section:
-                    task_breakdown["spike"] = True
-                if "poc" in lower_section or "proof of concept" in lower_section:
-                    task_breakdown["poc"] = True
-                if "implementation" in lower_section:
-                    task_breakdown["implementation"] = True
-                if "qa" in lower_section or "testing" in lower_section or "quality assurance" in lower_section:
-                    task_breakdown["qa"] = True
+                for keyword in _TASK_KEYWORD_RE.findall(task_breakdown_section):
+                    task_breakdown[_TASK_KEYWORDS[keyword.lower()]] = True
 
             return {
                 "high_level_design": high_level_design,
@@ -190,11 +238,11 @@ Avoid technical jargon, code references, or file names. Be thorough, realistic,
                 "technical_feasibility": technical_feasibility,
                 "rough_estimate": rough_estimate,
                 "task_breakdown": task_breakdown,
-                "messages": state.get("messages", []) + [f"Feasibility analysis completed for project {state.get('project_id')}"]
+                "messages": [f"Feasibility analysis completed for project {state.get('project_id')}"]
             }
             
         except Exception as e:
-            logger.error(f"Error in Feasibility Analysis agent: {str(e)}", exc_info=True)
+            logger.error("Error in Feasibility Analysis agent: %s", e, exc_info=True)
             error_msg = f"Feasibility Analysis agent failed: {str(e)}"
             return {
                 "high_level_design": error_msg,
@@ -203,7 +251,7 @@ Avoid technical jargon, code references, or file names. Be thorough, realistic,
                 "technical_feasibility": "Unknown",
                 "rough_estimate": {"error": error_msg},
                 "task_breakdown": {"error": error_msg},
-                "messages": state.get("messages", []) + [error_msg]
+                "messages": [error_msg]
             }
     
     return feasibility_analysis_node
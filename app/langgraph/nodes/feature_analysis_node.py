@@ -3,40 +3,23 @@ Feature Analysis Node
 Analyzes a feature in the codebase
 """
 
+import functools
 import logging
+import re
 from app.langgraph.state import FeatureAnalysisState
-from app.services.gemini_client import GeminiClient
+from app.langgraph.tools.codex_section_parser import budget_truncate
+from app.services.gemini_cache import cached_agenerate
 
 logger = logging.getLogger(__name__)
 
 
-def create_feature_analysis_node() -> callable:
-    """
-    Create a Feature Analysis node function.
-    
-    Returns:
-        Node function for LangGraph
-    """
-    gemini_client = GeminiClient()
+# Body of the "## Feature Overview" section, up to "## Key Capabilities" (or the end)
+_FEATURE_OVERVIEW_RE = re.compile(
+    r"##\s*Feature Overview\s*\n(?P<body>.*?)(?=\n##\s*Key Capabilities|\Z)", re.DOTALL
+)
 
-    def feature_analysis_node(state: FeatureAnalysisState) -> FeatureAnalysisState:
-        """
-        Feature Analysis Agent.
-        Uses Codex CLI analysis output to prepare feature details and high-level design.
-        """
-        try:
-            logger.info("Running Feature Analysis agent for project feature")
-            
-            codex_analysis = state.get("codex_analysis", "")
-            query = state.get("query", "")
-            
-            analysis_snippet = (codex_analysis or "").strip()
-            if len(analysis_snippet) > 6000:
-                analysis_snippet = analysis_snippet[:6000] + "\n\n[Truncated: analysis exceeded 6000 characters]"
-            if not analysis_snippet:
-                analysis_snippet = "N/A"
-
-            prompt = f"""
+# Prompt templates; only the query and Codex snippet are substituted per call
+FEATURE_PROMPT_TMPL = """
 You are a product analyst helping a product manager understand a feature in their codebase.
 
 Task:
@@ -86,32 +69,60 @@ Output format (use this structure exactly):
 [Outline important considerations for product decisions, user experience, or business logic]
 """
 
-            formatted_analysis = gemini_client.generate_content(
-                prompt,
-                system_prompt="""You are a product analyst helping product managers understand features in their codebase. 
+FEATURE_SYSTEM_PROMPT = """You are a product analyst helping product managers understand features in their codebase. 
 Write in business-friendly language. Focus on what features do from a user and product perspective, not technical implementation. 
 Avoid technical jargon, code references, file names, or API details. Be thorough and professional."""
+
+
+@functools.lru_cache(maxsize=1)
+def create_feature_analysis_node() -> callable:
+    """
+    Create a Feature Analysis node function.
+    
+    Returns:
+        Node function for LangGraph
+    """
+    async def feature_analysis_node(state: FeatureAnalysisState) -> FeatureAnalysisState:
+        """
+        Feature Analysis Agent.
+        Uses Codex CLI analysis output to prepare feature details and high-level design.
+        """
+        try:
+            logger.info("Running Feature Analysis agent for project feature")
+            
+            codex_analysis = state.get("codex_analysis", "")
+            query = state.get("query", "")
+            
+            # Keep whole Codex sections (highest priority first) within the prompt budget
+            analysis_snippet = budget_truncate(codex_analysis or "", 6000)
+            if not analysis_snippet:
+                analysis_snippet = "N/A"
+
+            prompt = FEATURE_PROMPT_TMPL.format(query=query, analysis_snippet=analysis_snippet)
+
+            formatted_analysis = await cached_agenerate(
+                prompt,
+                system_prompt=FEATURE_SYSTEM_PROMPT
             )
             
-            # Split the analysis into feature overview and feature details
-            # Simple parsing - in production, you might want more sophisticated parsing
-            parts = formatted_analysis.split("## Key Capabilities")
-            high_level_design = parts[0].replace("## Feature Overview", "").strip() if len(parts) > 0 else formatted_analysis
+            # The feature overview is the high-level design; the full analysis is the feature details
+            match = _FEATURE_OVERVIEW_RE.search(formatted_analysis)
+            high_level_design = match.group("body").strip() if match else formatted_analysis.strip()
             feature_details = formatted_analysis.strip()  # Keep full analysis as feature details
             
             return {
                 "high_level_design": high_level_design,
                 "feature_details": feature_details,
-                "messages": state.get("messages", []) + [f"Feature analysis completed"]
+                "messages": [f"Feature analysis completed"]
             }
             
         except Exception as e:
-            logger.error(f"Error in Feature Analysis agent: {str(e)}", exc_info=True)
+            logger.error("Error in Feature Analysis agent: %s", e, exc_info=True)
             error_msg = f"Feature Analysis agent failed: {str(e)}"
             return {
                 "high_level_design": error_msg,
                 "feature_details": error_msg,
-                "messages": state.get("messages", []) + [error_msg]
+                "messages": [error_msg]
             }
     
     return feature_analysis_node
@@ -2,10 +2,12 @@
 Prepare Analysis Node - Runs Codex analysis if needed for analysis requests
 """
 
+import asyncio
 import logging
 from app.langgraph.unified_state import UnifiedAgentState
-from app.langgraph.tools.codex_terminal_runner import run_codex_in_terminal
-from app.services.git_service import GitService
+from app.langgraph.tools.codex_cache import codex_fingerprint
+from app.services.git_service import get_repo_head
+from app.langgraph.tools.codex_terminal_runner import run_codex_in_terminal_async
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +19,7 @@ def create_prepare_analysis_node() -> callable:
     Returns:
         Node function for LangGraph
     """
-    def prepare_analysis_node(state: UnifiedAgentState) -> UnifiedAgentState:
+    async def prepare_analysis_node(state: UnifiedAgentState) -> UnifiedAgentState:
         """
         Prepare analysis by running Codex if needed.
         """
@@ -26,39 +28,46 @@ def create_prepare_analysis_node() -> callable:
             repo_path = state.get("repo_path")
             codex_analysis = state.get("codex_analysis", "")
             
+            # Only the fields this node changes are returned; LangGraph merges them into state
+            updates = {}
+            
             # Only prepare for analysis requests
             if request_type in ["feature_analysis", "feasibility_analysis"]:
-                # Run Codex if we have a query/requirement but no codex_analysis yet
+                # Run Codex if we have a query/requirement but no matching codex_analysis yet
                 query = state.get("query", "")
                 requirement = state.get("requirement", "")
                 context = state.get("context", "")
                 
-                if repo_path and not state.get("codebase_structure"):
-                    state = {
-                        **state,
-                        "codebase_structure": GitService().get_codebase_structure(repo_path)
-                    }
+                full_query = query or f"{requirement}\n\nContext: {context or ''}"
+                
+                # Existing analysis is only reused if it was produced for this repo HEAD and exact Codex query
+                fingerprint = None
+                if (query or requirement) and repo_path:
+                    git_head = await asyncio.to_thread(get_repo_head, repo_path)
+                    fingerprint = codex_fingerprint(git_head, full_query)
+                    if codex_analysis and state.get("codex_fingerprint") != fingerprint:
+                        logger.info("Discarding stale Codex analysis for %s", request_type)
+                        codex_analysis = ""
+                    updates["codex_fingerprint"] = fingerprint
                 
-                if (query or requirement) and not codex_analysis and repo_path:
-                    full_query = query or f"{requirement}\n\nContext: {context or ''}"
-                    logger.info(f"Running Codex analysis for {request_type}...")
-                    codex_analysis = run_codex_in_terminal(repo_path, full_query)
+                if fingerprint and not codex_analysis:
+                    logger.info("Running Codex analysis for %s...", request_type)
+                    codex_analysis = await run_codex_in_terminal_async(repo_path, full_query)
                     if codex_analysis:
-                        logger.info(f"Codex analysis completed for {request_type} -- {codex_analysis}")
+                        logger.info("Codex analysis completed for %s (%d chars)", request_type, len(codex_analysis))
                     else:
                         logger.warning("Codex analysis returned empty output.")
             
             return {
-                **state,
+                **updates,
                 "codex_analysis": codex_analysis,
-                "messages": state.get("messages", []) + ["Analysis preparation completed"]
+                "messages": ["Analysis preparation completed"]
             }
             
         except Exception as e:
-            logger.error(f"Error in prepare analysis node: {str(e)}", exc_info=True)
+            logger.error("Error in prepare analysis node: %s", e, exc_info=True)
             return {
-                **state,
-                "messages": state.get("messages", []) + [f"Prepare analysis error: {str(e)}"]
+                "messages": [f"Prepare analysis error: {str(e)}"]
             }
     
     return prepare_analysis_node
@@ -3,11 +3,76 @@ Router Node - Determines whether to route to chat or analysis agents
 """
 
 import logging
+import re
+from typing import Optional
 from app.langgraph.unified_state import UnifiedAgentState
-from app.services.gemini_client import GeminiClient
+from app.services.gemini_cache import cached_agenerate
 
 logger = logging.getLogger(__name__)
 
+# Keyword pre-classifier for new requests; mirrors the keywords listed in the routing prompt
+FEASIBILITY_RE = re.compile(
+    r"\b(analy[sz]e (the )?feasibility|can we add|is it possible to|estimate|new requirement|feasibility of)\b",
+    re.IGNORECASE
+)
+FEATURE_RE = re.compile(
+    r"\b(how does|explain the feature|what does .* feature do|analy[sz]e the feature)\b",
+    re.IGNORECASE
+)
+
+
+# Routing prompts; only the user message is substituted per call
+CHAT_CONTEXT_PROMPT = """
+You are a routing agent. The user is in a chat session asking a follow-up question.
+
+IMPORTANT: Default to "chat" unless they EXPLICITLY ask for a NEW analysis.
+
+Route to analysis ONLY if they say things like:
+- "Can you analyze..." or "Analyze the feasibility of..."
+- "How does [specific feature] work?" (asking about a specific feature in codebase)
+- "What is the feasibility of adding [new thing]?"
+
+Route to "chat" for:
+- Questions about estimates, risks, approach, questions (follow-ups)
+- "Does this...", "Are these...", "What about...", "Can you explain..."
+- Any clarification or follow-up question
+
+User message: {message}
+
+Respond with ONLY one word: "chat", "feasibility_analysis", or "feature_analysis"
+"""
+
+NEW_REQUEST_PROMPT = """
+You are a routing agent for a product assistant system. Analyze the user's request and determine the appropriate route.
+
+Available routes:
+1. "chat" - For general conversation or questions
+2. "feasibility_analysis" - For analyzing the feasibility of a NEW requirement (keywords: "analyze feasibility", "can we add", "is it possible to", "estimate", "new requirement")
+3. "feature_analysis" - For analyzing an EXISTING feature in the codebase (keywords: "how does", "explain the feature", "what does this feature do", "analyze the feature")
+
+User request: {message}
+
+Respond with ONLY one word: "chat", "feasibility_analysis", or "feature_analysis"
+"""
+
+ROUTER_SYSTEM_PROMPT = "You are a routing agent. Analyze the user's intent carefully. If they want NEW analysis, route to analysis. If they're asking follow-ups, route to chat. Respond with only one word: chat, feasibility_analysis, or feature_analysis."
+
+
+def _keyword_route(message: str) -> Optional[str]:
+    """
+    Classify a message by keywords.
+
+    Returns:
+        "feasibility_analysis" or "feature_analysis" when exactly one pattern matches, else None
+    """
+    is_feasibility = FEASIBILITY_RE.search(message) is not None
+    is_feature = FEATURE_RE.search(message) is not None
+    if is_feasibility and not is_feature:
+        return "feasibility_analysis"
+    if is_feature and not is_feasibility:
+        return "feature_analysis"
+    return None
+
 
 def create_router_node() -> callable:
     """
@@ -16,31 +81,27 @@ def create_router_node() -> callable:
     Returns:
         Node function for LangGraph
     """
-    gemini_client = GeminiClient()
-
-    def router_node(state: UnifiedAgentState) -> UnifiedAgentState:
+    async def router_node(state: UnifiedAgentState) -> UnifiedAgentState:
         """
         Router agent that determines whether to route to chat or analysis.
         Can detect analysis requests even when in a chat session.
         """
         try:
-            logger.info(f"Running Router agent for project {state.get('project_id')}")
+            logger.info("Running Router agent for project %s", state.get('project_id'))
             
             # Explicit parameters take priority (for direct API calls)
             # If query is provided, it's a feature analysis
             if state.get("query"):
                 return {
-                    **state,
                     "request_type": "feature_analysis",
-                    "messages": state.get("messages", []) + ["Routing to feature analysis agent"]
+                    "messages": ["Routing to feature analysis agent"]
                 }
             
             # If requirement is provided, it's a feasibility analysis
             if state.get("requirement"):
                 return {
-                    **state,
                     "request_type": "feasibility_analysis",
-                    "messages": state.get("messages", []) + ["Routing to feasibility analysis agent"]
+                    "messages": ["Routing to feasibility analysis agent"]
                 }
             
             # Get the user message (could be from chat or new request)
@@ -50,61 +111,37 @@ def create_router_node() -> callable:
                 # If chat_id exists but no message, default to chat
                 if state.get("chat_id"):
                     return {
-                        **state,
                         "request_type": "chat",
-                        "messages": state.get("messages", []) + ["No message provided, routing to chat"]
+                        "messages": ["No message provided, routing to chat"]
                     }
                 logger.warning("No message, query, or requirement found. Defaulting to chat.")
                 return {
-                    **state,
                     "request_type": "chat",
-                    "messages": state.get("messages", []) + ["No clear intent, routing to chat"]
+                    "messages": ["No clear intent, routing to chat"]
                 }
             
             # If chat_id exists and we have analysis context, this is likely a follow-up question
             # Only route to analysis if explicitly asking for NEW analysis
             has_chat_context = state.get("chat_id") and state.get("analysis_context")
             
-            if has_chat_context:
+            # Unambiguous keyword matches skip the Gemini round-trip. Never applied in chat sessions,
+            # where messages like "how does this work?" or "what about the estimate?" are usually chat.
+            route_decision = None if state.get("chat_id") else _keyword_route(message)
+            
+            if route_decision:
+                logger.info("Router keyword match, skipping LLM routing: %s", route_decision)
+            elif has_chat_context:
                 # In a chat session - be more conservative, default to chat unless clearly asking for new analysis
-                prompt = f"""
-You are a routing agent. The user is in a chat session asking a follow-up question.
-
-IMPORTANT: Default to "chat" unless they EXPLICITLY ask for a NEW analysis.
-
-Route to analysis ONLY if they say things like:
-- "Can you analyze..." or "Analyze the feasibility of..."
-- "How does [specific feature] work?" (asking about a specific feature in codebase)
-- "What is the feasibility of adding [new thing]?"
-
-Route to "chat" for:
-- Questions about estimates, risks, approach, questions (follow-ups)
-- "Does this...", "Are these...", "What about...", "Can you explain..."
-- Any clarification or follow-up question
-
-User message: {message}
-
-Respond with ONLY one word: "chat", "feasibility_analysis", or "feature_analysis"
-"""
+                prompt = CHAT_CONTEXT_PROMPT.format(message=message)
             else:
                 # New request (no chat context) - can be more aggressive about routing to analysis
-                prompt = f"""
-You are a routing agent for a product assistant system. Analyze the user's request and determine the appropriate route.
-
-Available routes:
-1. "chat" - For general conversation or questions
-2. "feasibility_analysis" - For analyzing the feasibility of a NEW requirement (keywords: "analyze feasibility", "can we add", "is it possible to", "estimate", "new requirement")
-3. "feature_analysis" - For analyzing an EXISTING feature in the codebase (keywords: "how does", "explain the feature", "what does this feature do", "analyze the feature")
-
-User request: {message}
-
-Respond with ONLY one word: "chat", "feasibility_analysis", or "feature_analysis"
-"""
+                prompt = NEW_REQUEST_PROMPT.format(message=message)
             
-            route_decision = gemini_client.generate_content(
-                prompt,
-                system_prompt="You are a routing agent. Analyze the user's intent carefully. If they want NEW analysis, route to analysis. If they're asking follow-ups, route to chat. Respond with only one word: chat, feasibility_analysis, or feature_analysis."
-            )
+            if not route_decision:
+                route_decision = await cached_agenerate(
+                    prompt,
+                    system_prompt=ROUTER_SYSTEM_PROMPT
+                )
             
             route_decision = route_decision.strip().lower()
             
@@ -114,52 +151,46 @@ Respond with ONLY one word: "chat", "feasibility_analysis", or "feature_analysis
                 # Extract requirement from message if not already set
                 if not state.get("requirement") and message:
                     updated_state = {
-                        **state,
                         "request_type": request_type,
                         "requirement": message,  # Set requirement for analysis
-                        "messages": state.get("messages", []) + [f"Router determined: {request_type}"]
+                        "messages": [f"Router determined: {request_type}"]
                     }
                 else:
                     updated_state = {
-                        **state,
                         "request_type": request_type,
-                        "messages": state.get("messages", []) + [f"Router determined: {request_type}"]
+                        "messages": [f"Router determined: {request_type}"]
                     }
             elif "feature" in route_decision and "analysis" in route_decision:
                 request_type = "feature_analysis"
                 # Extract query from message if not already set
                 if not state.get("query") and message:
                     updated_state = {
-                        **state,
                         "request_type": request_type,
                         "query": message,  # Set query for analysis
-                        "messages": state.get("messages", []) + [f"Router determined: {request_type}"]
+                        "messages": [f"Router determined: {request_type}"]
                     }
                 else:
                     updated_state = {
-                        **state,
                         "request_type": request_type,
-                        "messages": state.get("messages", []) + [f"Router determined: {request_type}"]
+                        "messages": [f"Router determined: {request_type}"]
                     }
             else:
                 request_type = "chat"
                 updated_state = {
-                    **state,
                     "request_type": request_type,
-                    "messages": state.get("messages", []) + [f"Router determined: {request_type}"]
+                    "messages": [f"Router determined: {request_type}"]
                 }
             
-            logger.info(f"Router determined request type: {request_type} (message: {message[:50]}...)")
+            logger.info("Router determined request type: %s (message: %s...)", request_type, message[:50])
             
             return updated_state
             
         except Exception as e:
-            logger.error(f"Error in Router agent: {str(e)}", exc_info=True)
+            logger.error("Error in Router agent: %s", e, exc_info=True)
             # Default to chat on error
             return {
-                **state,
                 "request_type": "chat",
-                "messages": state.get("messages", []) + [f"Router error, defaulting to chat: {str(e)}"]
+                "messages": [f"Router error, defaulting to chat: {str(e)}"]
             }
     
     return router_node
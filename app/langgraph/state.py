@@ -8,10 +8,8 @@ from typing import Dict, Any, List, TypedDict, Optional
 class FeatureAnalysisState(TypedDict):
     """State schema for feature analysis workflow"""
     project_id: str
-    recipe_id: Optional[int]  # Optional - not needed for project feature discovery
     query: str
     repo_path: Optional[str]
-    codebase_structure: Dict[str, Any]
     codex_analysis: str
     high_level_design: str
     feature_details: str
@@ -24,7 +22,6 @@ class FeasibilityAnalysisState(TypedDict):
     requirement: str
     context: Optional[str]
     repo_path: Optional[str]
-    codebase_structure: Dict[str, Any]
     codex_analysis: str
     high_level_design: str
     risks: List[str]
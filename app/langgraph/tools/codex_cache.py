@@ -0,0 +1,149 @@
+"""
+On-disk cache for Codex analysis results.
+Entries are keyed by the repo HEAD commit, the prompt and the Codex CLI version,
+so a re-submitted requirement against an unchanged repo skips the Codex run.
+"""
+
+import functools
+import hashlib
+import logging
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.config import CODEX_CACHE_ENABLED, CODEX_CACHE_DIR, CODEX_CACHE_TTL_SECONDS
+from app.services.git_service import get_repo_head
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def _codex_version() -> str:
+    """Codex CLI version string (cached for the process lifetime)."""
+    try:
+        return subprocess.run(
+            ["codex", "--version"], capture_output=True, text=True, check=False, timeout=10
+        ).stdout.strip()
+    except Exception as e:
+        logger.warning("Could not determine Codex version: %s", str(e))
+        return ""
+
+
+def codex_cache_file(repo_path: str, prompt: str) -> Optional[Path]:
+    """
+    Cache entry path for a (repo, prompt) pair.
+
+    Resolve it once per Codex run and pass it to both get_cached_analysis() and
+    set_cached_analysis(), so the lookup and the store use the same HEAD.
+
+    Args:
+        repo_path: Path to the cloned repository
+        prompt: Full prompt sent to Codex
+
+    Returns:
+        Cache file path, or None if caching is disabled or the repo HEAD is unknown
+    """
+    if not CODEX_CACHE_ENABLED:
+        return None
+    git_head = get_repo_head(repo_path)
+    if not git_head:
+        return None
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    key = hashlib.sha256(f"{git_head}:{prompt_hash}:{_codex_version()}".encode("utf-8")).hexdigest()
+    return Path(CODEX_CACHE_DIR) / f"{key}.txt"
+
+
+def get_cached_analysis(cache_file: Optional[Path]) -> Optional[str]:
+    """
+    Look up a cached Codex analysis.
+
+    Args:
+        cache_file: Entry path from codex_cache_file()
+
+    Returns:
+        Cached analysis text, or None on miss (or if caching is disabled/unavailable)
+    """
+    if not cache_file:
+        return None
+    try:
+        if time.time() - cache_file.stat().st_mtime > CODEX_CACHE_TTL_SECONDS:
+            return None
+        return cache_file.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning("Codex cache lookup failed: %s", str(e))
+        return None
+
+
+def set_cached_analysis(cache_file: Optional[Path], analysis: str) -> None:
+    """
+    Store a Codex analysis in the cache.
+
+    Args:
+        cache_file: Entry path from codex_cache_file()
+        analysis: Analysis text to store
+    """
+    if not cache_file or not analysis:
+        return
+    tmp_name = None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a unique temp file then rename, so readers never see a partial entry
+        # and concurrent writers of the same entry never share a temp file
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=cache_file.parent, suffix=".tmp", delete=False
+        ) as tmp_file:
+            tmp_name = tmp_file.name
+            tmp_file.write(analysis)
+        os.replace(tmp_name, cache_file)
+    except OSError as e:
+        logger.warning("Codex cache write failed: %s", str(e))
+        if tmp_name:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+
+
+def prune_expired() -> int:
+    """
+    Delete cache entries older than the TTL.
+
+    Returns:
+        Number of entries removed
+    """
+    cache_dir = Path(CODEX_CACHE_DIR)
+    if not CODEX_CACHE_ENABLED or not cache_dir.is_dir():
+        return 0
+    cutoff = time.time() - CODEX_CACHE_TTL_SECONDS
+    removed = 0
+    for cache_file in cache_dir.glob("*.txt"):
+        try:
+            if cache_file.stat().st_mtime < cutoff:
+                cache_file.unlink()
+                removed += 1
+        except OSError:
+            continue
+    if removed:
+        logger.info("Pruned %s expired Codex cache entries", removed)
+    return removed
+
+
+def codex_fingerprint(git_head: Optional[str], codex_query: Optional[str]) -> str:
+    """
+    Compact identity of a Codex analysis: repo HEAD plus the exact query sent to Codex.
+
+    Args:
+        git_head: HEAD commit SHA of the analysed repo
+        codex_query: Query passed to the Codex runner (requirement and context included)
+
+    Returns:
+        24-character hex digest
+    """
+    return hashlib.blake2b(
+        f"{git_head or ''}|{codex_query or ''}".encode("utf-8"), digest_size=12
+    ).hexdigest()
@@ -0,0 +1,102 @@
+"""
+Helpers for fitting Codex analysis output into an LLM prompt budget.
+Codex answers in numbered sections ("1. Product Impact", "2. Existing Capabilities", ...),
+so whole sections are kept in priority order instead of cutting the text mid-sentence.
+"""
+
+import re
+
+# Numbered line that may start a top-level section, e.g. "5. High-Level Product Approach"
+_NUMBERED_LINE_RE = re.compile(r"(?m)^(\d+)\.\s+(\S.*)$")
+
+# Top-level headings requested by PRODUCT_ANALYST_PROMPT_SUFFIX, keyed by section number
+SECTION_TITLES = {
+    1: "Product Impact",
+    2: "Existing Capabilities",
+    3: "Business Risks",
+    4: "Quality Assurance",
+    5: "High-Level Product Approach",
+    6: "Implementation Strategy",
+    7: "Estimation",
+    8: "Task Breakdown",
+    9: "Dependencies",
+    10: "Acceptance Criteria",
+}
+
+# Impact, existing capabilities, approach, implementation strategy, estimation, task breakdown
+PRIORITY_SECTIONS = (1, 2, 5, 6, 7, 8)
+
+_SEPARATOR = "\n\n"
+
+
+def _split_sections(text: str) -> tuple:
+    """
+    Split Codex output at its known top-level headings.
+
+    A numbered line only starts a section when it carries the expected heading
+    for its number and the number is higher than the current section's, so
+    nested numbered lists ("1. Auth service must exist") stay inside their section.
+
+    Returns:
+        (chunks, numbers) where numbers[i] is the section number of chunks[i] (None for a preamble)
+    """
+    starts = []
+    current = 0
+    for match in _NUMBERED_LINE_RE.finditer(text):
+        number = int(match.group(1))
+        title = SECTION_TITLES.get(number)
+        if number > current and title and match.group(2).lower().startswith(title.lower()):
+            starts.append((match.start(), number))
+            current = number
+
+    chunks = []
+    numbers = []
+    if starts and text[: starts[0][0]].strip():
+        chunks.append(text[: starts[0][0]].strip())
+        numbers.append(None)
+    for i, (start, number) in enumerate(starts):
+        end = starts[i + 1][0] if i + 1 < len(starts) else len(text)
+        chunks.append(text[start:end].strip())
+        numbers.append(number)
+    return chunks, numbers
+
+
+def budget_truncate(text: str, max_chars: int) -> str:
+    """
+    Shorten Codex output to at most max_chars by dropping whole sections.
+
+    Priority sections are packed first, then the remaining ones, and the kept
+    sections are emitted in their original order. Output without the expected
+    section headings falls back to a plain prefix slice.
+
+    Args:
+        text: Codex analysis text
+        max_chars: Character budget for the result
+
+    Returns:
+        Text of at most max_chars characters, with a note if anything was dropped
+    """
+    text = text.strip()
+    if len(text) <= max_chars:
+        return text
+
+    note = f"{_SEPARATOR}[Truncated: analysis exceeded {max_chars} characters]"
+    budget = max_chars - len(note)
+
+    chunks, numbers = _split_sections(text)
+
+    # Priority sections first, then everything else in document order
+    order = [i for number in PRIORITY_SECTIONS for i, n in enumerate(numbers) if n == number]
+    order += [i for i in range(len(chunks)) if i not in order]
+
+    kept = set()
+    used = 0
+    for i in order:
+        size = len(chunks[i]) + (len(_SEPARATOR) if kept else 0)
+        if used + size <= budget:
+            kept.add(i)
+            used += size
+
+    if not kept:
+        return text[:budget].strip() + note
+    return _SEPARATOR.join(chunks[i] for i in sorted(kept)) + note
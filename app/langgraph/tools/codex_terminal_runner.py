@@ -3,36 +3,104 @@ Run Codex analysis in a subprocess using the cloned repo as the working director
 Based on jira-planbot implementation
 """
 
+import asyncio
+import collections
 import os
 import subprocess
+import tempfile
+import threading
 import time
-from pathlib import Path
 import logging
+from typing import Optional
+
+from app.config import CODEX_TIMEOUT_SECONDS, CODEX_MAX_CONCURRENCY
+from app.langgraph.tools.codex_cache import codex_cache_file, get_cached_analysis, set_cached_analysis
 
 logger = logging.getLogger(__name__)
 
+# Lines of Codex stdout/stderr kept for fallback output and error logging
+_OUTPUT_TAIL_LINES = 200
+_PROGRESS_LOG_INTERVAL_SECONDS = 10
 
-def run_codex_in_terminal(repo_path: str, requirement_summary: str) -> str:
-    """
-    Run Codex analysis in a separate process with cwd set to the cloned repo.
+# Codex output files go to tmpfs when available so they never touch disk
+_OUTPUT_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
 
-    Args:
-        repo_path: Path to the cloned repository
-        requirement_summary: Requirement description/query
 
-    Returns:
-        Analysis text (stdout) or an empty string on failure.
+class _CodexSlots:
     """
-    if not repo_path:
-        logger.warning("No repo_path provided for terminal Codex analysis.")
-        return ""
+    FIFO cap on concurrently running Codex processes.
 
-    # Ensure PYTHONPATH points to the project root (parent of "app")
-    env = os.environ.copy()
-    output_path = f"/tmp/codex_last_message_{os.getpid()}_{int(time.time())}.txt"
+    Callers come from worker threads and from separate event loops (asyncio.run per
+    background task), so an asyncio.Semaphore bound to one loop cannot be used. A
+    released slot is handed straight to the longest waiter, sync or async, so queued
+    runs start immediately and neither kind of caller can starve the other.
+    """
 
-    prompt = f"""
-You are a product strategist and business analyst helping a product manager understand the feasibility and effort required for a new feature or requirement.
+    def __init__(self, slots: int):
+        self._lock = threading.Lock()
+        self._free = slots
+        # Wake-up callables of waiting callers, oldest first
+        self._waiters = collections.deque()
+
+    def acquire(self) -> None:
+        """Block the calling thread until a slot is available."""
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            granted = threading.Event()
+            self._waiters.append(granted.set)
+        granted.wait()
+
+    async def acquire_async(self) -> None:
+        """Wait for a slot without blocking the event loop (cancellation-safe: no slot is leaked)."""
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def grant() -> None:
+            if not granted.done():
+                granted.set_result(None)
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(grant)
+
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return
+            self._waiters.append(wake)
+        try:
+            await granted
+        except asyncio.CancelledError:
+            with self._lock:
+                handed_over = wake not in self._waiters
+                if not handed_over:
+                    self._waiters.remove(wake)
+            if handed_over:
+                # The slot arrived as we were cancelled; pass it on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Return a slot, handing it to the longest waiter if there is one."""
+        with self._lock:
+            while self._waiters:
+                wake = self._waiters.popleft()
+                try:
+                    wake()
+                    return
+                except RuntimeError:
+                    # The waiter's event loop has already closed
+                    continue
+            self._free += 1
+
+
+# Process-wide cap on running Codex processes
+_CODEX_SLOTS = _CodexSlots(max(1, CODEX_MAX_CONCURRENCY))
+
+
+# Static parts of the analysis prompt; only the requirement is inserted per call
+PRODUCT_ANALYST_PROMPT_PREFIX = """You are a product strategist and business analyst helping a product manager understand the feasibility and effort required for a new feature or requirement.
 
 Rules:
 - Read-only analysis
@@ -53,7 +121,9 @@ Task:
 - Provide an estimation (story points + time in hours) and complexity/risk assessment
 
 Requirement/Query:
-{requirement_summary or ""}
+"""
+
+PRODUCT_ANALYST_PROMPT_SUFFIX = """
 
 Respond in the following format:
 
@@ -105,52 +175,298 @@ Respond in the following format:
 
 10. Acceptance Criteria
     - What defines success from a product perspective?
-    - What user outcomes should be achieved?
+    - What user outcomes should be achieved?"""
+
+# argv template for `codex exec`; repo path and output path are filled per call
+_CODEX_ARGV = (
+    "codex",
+    "exec",
+    "-C",
+    None,  # repo_path
+    "--sandbox",
+    "read-only",
+    "--color",
+    "never",
+    "--output-last-message",
+    None,  # output_path
+    "-",
+)
+
+
+def _build_analysis_prompt(requirement_summary: str) -> str:
+    """Build the Codex prompt used for requirement/query analysis."""
+    return PRODUCT_ANALYST_PROMPT_PREFIX + (requirement_summary or "") + PRODUCT_ANALYST_PROMPT_SUFFIX
+
+
+def _codex_command(repo_path: str, output_path: str) -> list:
+    """Build the `codex exec` argv for a read-only run in repo_path."""
+    argv = list(_CODEX_ARGV)
+    argv[3] = repo_path
+    argv[9] = output_path
+    return argv
+
+
+def _new_output_path() -> str:
+    """Create a unique file for Codex's --output-last-message (tmpfs when available)."""
+    with tempfile.NamedTemporaryFile(
+        prefix="codex_last_", suffix=".txt", dir=_OUTPUT_DIR, delete=False
+    ) as output_file:
+        return output_file.name
+
+
+def _read_output_file(output_path: str) -> str:
+    """Read Codex's last-message file, decoding once; empty string if unreadable."""
+    try:
+        with open(output_path, "rb") as output_file:
+            return output_file.read().decode("utf-8", errors="ignore").strip()
+    except OSError as read_error:
+        logger.warning("Failed to read Codex output file: %s", str(read_error))
+        return ""
 
-""".strip()
 
+def _remove_output_file(output_path: str) -> None:
+    """Delete a Codex output file, ignoring files that are already gone."""
     try:
-        result = subprocess.run(
-            [
-                "codex",
-                "exec",
-                "-C",
-                repo_path,
-                "--sandbox",
-                "read-only",
-                "--color",
-                "never",
-                "--output-last-message",
-                output_path,
-                "-",
-            ],
+        os.unlink(output_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning("Failed to remove Codex output file %s: %s", output_path, str(e))
+
+
+def _kill_if_running(proc: Optional[asyncio.subprocess.Process]) -> bool:
+    """
+    Kill a Codex subprocess that has not exited yet.
+
+    Returns:
+        True if the process was still running and has been sent SIGKILL
+    """
+    if proc is None or proc.returncode is not None:
+        return False
+    try:
+        proc.kill()
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def _drain_stream(stream, sink: collections.deque) -> None:
+    """Read a binary process stream line by line into a (bounded) deque until EOF."""
+    for line in iter(stream.readline, b""):
+        sink.append(line)
+    stream.close()
+
+
+def _run_codex_process(repo_path: str, output_path: str, prompt: str) -> subprocess.CompletedProcess:
+    """
+    Run `codex exec` with the prompt on stdin, reading output incrementally.
+
+    Only the last _OUTPUT_TAIL_LINES lines of stdout/stderr are kept (the full
+    output when debug logging is on); the answer itself is read from the
+    --output-last-message file. The process is killed after CODEX_TIMEOUT_SECONDS.
+
+    Returns:
+        CompletedProcess with the tail of stdout/stderr as bytes (returncode -9 on timeout)
+    """
+    tail_lines = None if logger.isEnabledFor(logging.DEBUG) else _OUTPUT_TAIL_LINES
+    stdout_tail = collections.deque(maxlen=tail_lines)
+    stderr_tail = collections.deque(maxlen=tail_lines)
+    command = _codex_command(repo_path, output_path)
+
+    proc = subprocess.Popen(
+        command,
+        cwd=repo_path,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    readers = [
+        threading.Thread(target=_drain_stream, args=(proc.stdout, stdout_tail), daemon=True),
+        threading.Thread(target=_drain_stream, args=(proc.stderr, stderr_tail), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    try:
+        proc.stdin.write(prompt.encode("utf-8"))
+        proc.stdin.close()
+    except BrokenPipeError:
+        # Codex exited before reading the whole prompt; its return code tells the story
+        pass
+
+    started = time.monotonic()
+    while True:
+        try:
+            proc.wait(timeout=_PROGRESS_LOG_INTERVAL_SECONDS)
+            break
+        except subprocess.TimeoutExpired:
+            elapsed = time.monotonic() - started
+            if elapsed >= CODEX_TIMEOUT_SECONDS:
+                logger.error("Codex analysis timed out after %ss; killing process", CODEX_TIMEOUT_SECONDS)
+                proc.kill()
+                proc.wait()
+                stderr_tail.append(f"Timed out after {CODEX_TIMEOUT_SECONDS}s".encode("utf-8"))
+                break
+            logger.info("Codex analysis still running (%ss elapsed)", int(elapsed))
+
+    for reader in readers:
+        reader.join(timeout=5)
+
+    return subprocess.CompletedProcess(command, proc.returncode, b"".join(stdout_tail), b"".join(stderr_tail))
+
+
+def _codex_output(output_path: str, returncode: int, stdout: bytes, stderr: bytes, warn_if_empty: bool) -> str:
+    """
+    Answer of a finished Codex run: the --output-last-message file, else stdout.
+
+    Args:
+        output_path: Codex's last-message file
+        returncode: Process return code
+        stdout: Captured stdout (or its tail)
+        stderr: Captured stderr (or its tail)
+        warn_if_empty: Log a warning when the run succeeded but produced no text
+
+    Returns:
+        Answer text, or an empty string if Codex failed or said nothing
+    """
+    if returncode != 0:
+        logger.error(
+            "Terminal Codex analysis failed (rc=%s): %s",
+            returncode,
+            stderr.decode("utf-8", errors="replace").strip(),
+        )
+        return ""
+
+    output_text = _read_output_file(output_path) or stdout.decode("utf-8", errors="ignore").strip()
+    if not output_text and warn_if_empty:
+        logger.warning(
+            "Codex returned empty output (rc=%s). stderr=%s",
+            returncode,
+            stderr.decode("utf-8", errors="replace").strip(),
+        )
+    return output_text
+
+
+def _run_codex(repo_path: str, prompt: str, warn_if_empty: bool) -> str:
+    """
+    Run one Codex process under a concurrency slot, blocking the calling thread.
+
+    Returns:
+        Answer text, or an empty string on failure
+    """
+    output_path = _new_output_path()
+    try:
+        _CODEX_SLOTS.acquire()
+        try:
+            result = _run_codex_process(repo_path, output_path, prompt)
+        finally:
+            _CODEX_SLOTS.release()
+        return _codex_output(output_path, result.returncode, result.stdout, result.stderr, warn_if_empty)
+    except Exception as e:
+        logger.error("Error running terminal Codex analysis: %s", e, exc_info=True)
+        return ""
+    finally:
+        _remove_output_file(output_path)
+
+
+async def _run_codex_async(repo_path: str, prompt: str, warn_if_empty: bool) -> str:
+    """
+    Run one Codex process under a concurrency slot without blocking the event loop.
+
+    The process is killed on timeout and when the caller is cancelled.
+
+    Returns:
+        Answer text, or an empty string on failure
+    """
+    output_path = _new_output_path()
+    slot_acquired = False
+    proc = None
+    try:
+        await _CODEX_SLOTS.acquire_async()
+        slot_acquired = True
+        proc = await asyncio.create_subprocess_exec(
+            *_codex_command(repo_path, output_path),
             cwd=repo_path,
-            env=env,
-            input=prompt,
-            text=True,
-            capture_output=True,
-            check=False,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
-        if result.returncode != 0:
-            logger.error(
-                "Terminal Codex analysis failed (rc=%s): %s",
-                result.returncode,
-                (result.stderr or "").strip(),
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                proc.communicate(prompt.encode("utf-8")), timeout=CODEX_TIMEOUT_SECONDS
             )
+        except asyncio.TimeoutError:
+            logger.error("Codex analysis timed out after %ss; killing process", CODEX_TIMEOUT_SECONDS)
             return ""
+        return _codex_output(output_path, proc.returncode, stdout, stderr, warn_if_empty)
+    except Exception as e:
+        logger.error("Error running terminal Codex analysis: %s", e, exc_info=True)
+        return ""
+    finally:
+        # Timed out or cancelled (e.g. the client disconnected): don't leave Codex running
+        killed = _kill_if_running(proc)
+        if slot_acquired:
+            _CODEX_SLOTS.release()
+        _remove_output_file(output_path)
+        if killed:
+            await proc.wait()
 
-        try:
-            output_file = Path(output_path)
-            if output_file.exists():
-                return output_file.read_text(errors="ignore").strip()
-        except Exception as read_error:
-            logger.warning("Failed to read Codex output file: %s", str(read_error))
 
-        return (result.stdout or "").strip()
-    except Exception as e:
-        logger.error(f"Error running terminal Codex analysis: {str(e)}", exc_info=True)
+def run_codex_in_terminal(repo_path: str, requirement_summary: str) -> str:
+    """
+    Run Codex analysis in a separate process with cwd set to the cloned repo.
+
+    Args:
+        repo_path: Path to the cloned repository
+        requirement_summary: Requirement description/query
+
+    Returns:
+        Analysis text (stdout) or an empty string on failure.
+    """
+    if not repo_path:
+        logger.warning("No repo_path provided for terminal Codex analysis.")
+        return ""
+
+    prompt = _build_analysis_prompt(requirement_summary)
+
+    cache_file = codex_cache_file(repo_path, prompt)
+    cached = get_cached_analysis(cache_file)
+    if cached is not None:
+        logger.info("Codex cache hit for %s", repo_path)
+        return cached
+
+    analysis = _run_codex(repo_path, prompt, warn_if_empty=False)
+    set_cached_analysis(cache_file, analysis)
+    return analysis
+
+
+async def run_codex_in_terminal_async(repo_path: str, requirement_summary: str) -> str:
+    """
+    Async variant of run_codex_in_terminal() that does not block the event loop.
+
+    Args:
+        repo_path: Path to the cloned repository
+        requirement_summary: Requirement description/query
+
+    Returns:
+        Analysis text (stdout) or an empty string on failure.
+    """
+    if not repo_path:
+        logger.warning("No repo_path provided for terminal Codex analysis.")
         return ""
 
+    prompt = _build_analysis_prompt(requirement_summary)
+
+    cache_file = await asyncio.to_thread(codex_cache_file, repo_path, prompt)
+    cached = await asyncio.to_thread(get_cached_analysis, cache_file)
+    if cached is not None:
+        logger.info("Codex cache hit for %s", repo_path)
+        return cached
+
+    analysis = await _run_codex_async(repo_path, prompt, warn_if_empty=False)
+    await asyncio.to_thread(set_cached_analysis, cache_file, analysis)
+    return analysis
+
 
 def run_codex_raw_prompt(repo_path: str, prompt: str) -> str:
     """
@@ -171,59 +487,26 @@ def run_codex_raw_prompt(repo_path: str, prompt: str) -> str:
         logger.warning("Empty prompt provided for terminal Codex analysis.")
         return ""
 
-    env = os.environ.copy()
-    output_path = f"/tmp/codex_last_message_{os.getpid()}_{int(time.time())}.txt"
-    raw_prompt = prompt.strip()
+    return _run_codex(repo_path, prompt.strip(), warn_if_empty=True)
 
-    try:
-        result = subprocess.run(
-            [
-                "codex",
-                "exec",
-                "-C",
-                repo_path,
-                "--sandbox",
-                "read-only",
-                "--color",
-                "never",
-                "--output-last-message",
-                output_path,
-                "-",
-            ],
-            cwd=repo_path,
-            env=env,
-            input=raw_prompt,
-            text=True,
-            capture_output=True,
-            check=False,
-        )
-        if result.returncode != 0:
-            logger.error(
-                "Terminal Codex analysis failed (rc=%s): %s",
-                result.returncode,
-                (result.stderr or "").strip(),
-            )
-            return ""
 
-        try:
-            output_file = Path(output_path)
-            if output_file.exists():
-                output_text = output_file.read_text(errors="ignore").strip()
-                if output_text:
-                    return output_text
-        except Exception as read_error:
-            logger.warning("Failed to read Codex output file: %s", str(read_error))
-
-        stdout_text = (result.stdout or "").strip()
-        if stdout_text:
-            return stdout_text
+async def run_codex_raw_prompt_async(repo_path: str, prompt: str) -> str:
+    """
+    Async variant of run_codex_raw_prompt() that does not block the event loop.
 
-        logger.warning(
-            "Codex returned empty output (rc=%s). stderr=%s",
-            result.returncode,
-            (result.stderr or "").strip(),
-        )
+    Args:
+        repo_path: Path to the cloned repository
+        prompt: Raw prompt to pass through verbatim
+
+    Returns:
+        Analysis text (stdout) or an empty string on failure.
+    """
+    if not repo_path:
+        logger.warning("No repo_path provided for terminal Codex analysis.")
         return ""
-    except Exception as e:
-        logger.error(f"Error running terminal Codex analysis: {str(e)}", exc_info=True)
+
+    if not prompt:
+        logger.warning("Empty prompt provided for terminal Codex analysis.")
         return ""
+
+    return await _run_codex_async(repo_path, prompt.strip(), warn_if_empty=True)
@@ -2,25 +2,30 @@
 Unified LangGraph workflow with routing between chat and analysis agents
 """
 
-from typing import Any
+from typing import Any, Optional
 from langgraph.graph import StateGraph, END
 from app.langgraph.unified_state import UnifiedAgentState
-from app.langgraph.nodes.router_node import create_router_node
-from app.langgraph.nodes.chat_node import create_chat_node
-from app.langgraph.nodes.prepare_analysis_node import create_prepare_analysis_node
-from app.langgraph.nodes.analysis_adapters import (
-    create_feature_analysis_adapter,
-    create_feasibility_analysis_adapter
-)
 
 
-def create_unified_graph() -> Any:
+def create_unified_graph(checkpointer: Optional[Any] = None) -> Any:
     """
     Create and compile the unified workflow graph with routing.
     
+    Args:
+        checkpointer: Optional LangGraph checkpointer for persisting state per thread
+    
     Returns:
         Compiled LangGraph application
     """
+    # Node modules pull in the Gemini SDK and GitPython, so import them only when a graph is built
+    from app.langgraph.nodes.router_node import create_router_node
+    from app.langgraph.nodes.chat_node import create_chat_node
+    from app.langgraph.nodes.prepare_analysis_node import create_prepare_analysis_node
+    from app.langgraph.nodes.analysis_adapters import (
+        create_feature_analysis_adapter,
+        create_feasibility_analysis_adapter
+    )
+    
     # Create node functions
     router_node = create_router_node()
     prepare_analysis_node = create_prepare_analysis_node()
@@ -35,6 +40,7 @@ def create_unified_graph() -> Any:
     workflow.add_node("router", router_node)
     workflow.add_node("prepare_analysis", prepare_analysis_node)
     workflow.add_node("chat", chat_node)
+    # Repeated analyses with identical inputs are served by the Gemini response cache
     workflow.add_node("feature_analysis", feature_adapter)
     workflow.add_node("feasibility_analysis", feasibility_adapter)
     
@@ -80,4 +86,4 @@ def create_unified_graph() -> Any:
     workflow.add_edge("feasibility_analysis", END)
     
     # Compile and return
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
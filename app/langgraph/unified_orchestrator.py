@@ -3,27 +3,62 @@ Unified Orchestrator - Routes between chat and analysis agents
 Similar to Google ADK's coordinator pattern
 """
 
-import json
+import functools
 import logging
-from typing import Dict, Any, Optional
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
 from app.langgraph.unified_state import UnifiedAgentState
 from app.langgraph.unified_graph import create_unified_graph
 from app.services.git_service import GitService
 from app.models.db_models import Chat
-from app.config import MAX_CONVERSATION_HISTORY_MESSAGES
+from app.config import (
+    MAX_CONVERSATION_HISTORY_MESSAGES,
+    GRAPH_CHECKPOINT_ENABLED,
+    GRAPH_CHECKPOINT_PATH
+)
+from app.utils import get_project_repo_path
 
 logger = logging.getLogger(__name__)
 
+# Analysis context stored on the chat for follow-up questions
+FEATURE_CONTEXT_TMPL = """
+Query: {query}
 
-def _create_chat_session(
+Feature Overview:
+{high_level_design}
+
+Feature Details:
+{feature_details}
+"""
+
+FEASIBILITY_CONTEXT_TMPL = """
+Requirement: {requirement}
+Context: {context}
+
+High-Level Approach:
+{high_level_design}
+
+Feasibility: {technical_feasibility}
+
+Risks:
+{risks_block}
+
+Open Questions:
+{questions_block}
+
+Estimate: {rough_estimate}
+"""
+
+def _stage_chat_session(
     db: Session,
     project_id: str,
     analysis_type: str,
     analysis_context: str
 ) -> Optional[int]:
     """
-    Helper function to create a chat session for follow-up questions.
+    Helper function to add a chat session for follow-up questions.
+    The chat is flushed (to assign its id) but not committed; the caller commits.
     
     Returns:
         chat_id if successful, None otherwise
@@ -31,30 +66,72 @@ def _create_chat_session(
     try:
         chat = Chat(
             project_id=project_id,
-            recipe_id=None,  # Kept for backward compatibility only
             analysis_type=analysis_type,
             analysis_context=analysis_context,
-            conversation_history="[]"
+            conversation_history=[]
         )
         db.add(chat)
-        db.commit()
-        db.refresh(chat)
-        logger.info(f"Created chat session {chat.id} for {analysis_type} analysis")
+        db.flush()
+        logger.info("Created chat session %s for %s analysis", chat.id, analysis_type)
         return chat.id
     except Exception as e:
-        logger.error(f"Error creating chat session: {str(e)}", exc_info=True)
+        logger.error("Error creating chat session: %s", e, exc_info=True)
         db.rollback()
         return None
 
 
+def _create_checkpointer() -> Tuple[Optional[Any], Optional[Any]]:
+    """
+    SQLite checkpointer for the unified graph and the aiosqlite connection it uses.
+
+    Returns:
+        (checkpointer, connection), or (None, None) if disabled or unavailable
+    """
+    if not GRAPH_CHECKPOINT_ENABLED:
+        return None, None
+    try:
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    except ImportError:
+        logger.warning("GRAPH_CHECKPOINT_ENABLED is set but langgraph-checkpoint-sqlite is not installed")
+        return None, None
+    try:
+        # The saver binds to the running event loop, so the graph must first be built from async code
+        conn = aiosqlite.connect(GRAPH_CHECKPOINT_PATH)
+        return AsyncSqliteSaver(conn), conn
+    except RuntimeError as e:
+        logger.warning("Graph checkpointer not created outside the event loop: %s", e)
+        return None, None
+
+
+@functools.lru_cache(maxsize=1)
+def _get_graph() -> Tuple[Any, Optional[Any]]:
+    """
+    Compiled unified graph, built once per process (the topology never changes).
+
+    Returns:
+        (graph, checkpoint connection or None)
+    """
+    checkpointer, conn = _create_checkpointer()
+    return create_unified_graph(checkpointer=checkpointer), conn
+
+
+@functools.lru_cache(maxsize=1)
+def _get_stateless_graph() -> Any:
+    """Compiled unified graph without a checkpointer, for standalone (non-chat) analyses."""
+    graph, _ = _get_graph()
+    return graph if graph.checkpointer is None else create_unified_graph()
+
+
 class UnifiedOrchestrator:
     """Unified orchestrator that routes between chat and analysis agents"""
     
     def __init__(self):
-        self.graph = create_unified_graph()
+        self.graph, self._checkpoint_conn = _get_graph()
+        self.stateless_graph = _get_stateless_graph()
         self.git_service = GitService()
     
-    def run(
+    async def run(
         self,
         project_id: str,
         db: Optional[Session] = None,
@@ -86,41 +163,30 @@ class UnifiedOrchestrator:
             Dictionary with results based on request type
         """
         try:
-            # Get repo_path from database if not provided
+            # Get repo_path from database if not provided (cached per project)
             if not repo_path and db:
-                from app.models.db_models import Project
-                project = db.query(Project).filter(Project.project_id == project_id).first()
-                if project:
-                    repo_path = project.repo_path
+                try:
+                    repo_path = get_project_repo_path(project_id)
+                except LookupError:
+                    pass
             
-            # Get codebase structure if repo_path is available
-            codebase_structure = {}
             codex_analysis = ""
             
             # Codex analysis will be run by prepare_analysis_node in the graph workflow
             # No need to run it here - prepare_analysis_node handles it for all analysis requests
             
+            # Load the chat once; the same ORM object is updated after the graph run
+            chat = db.get(Chat, chat_id) if chat_id and db else None
+            
             # Load conversation history if chat_id is provided
             conversation_history = []
             analysis_context = None
-            if chat_id and db:
-                chat = db.query(Chat).filter(Chat.id == chat_id).first()
-                if chat:
-                    analysis_context = chat.analysis_context
-                    if chat.conversation_history:
-                        try:
-                            conversation_history = json.loads(chat.conversation_history)
-                            # Truncate to keep only recent messages to prevent context window overflow
-                            original_length = len(conversation_history)
-                            if original_length > MAX_CONVERSATION_HISTORY_MESSAGES:
-                                # Keep the most recent messages (last N messages)
-                                conversation_history = conversation_history[-MAX_CONVERSATION_HISTORY_MESSAGES:]
-                                logger.warning(
-                                    f"Truncated conversation history from {original_length} "
-                                    f"to {len(conversation_history)} messages for chat_id {chat_id}"
-                                )
-                        except json.JSONDecodeError:
-                            conversation_history = []
+            if chat:
+                analysis_context = chat.analysis_context
+                # Bounded deque keeps only the most recent messages to prevent context window overflow
+                conversation_history = deque(
+                    chat.conversation_history or [], maxlen=MAX_CONVERSATION_HISTORY_MESSAGES
+                )
             
             # Don't set query/requirement from message yet - let router decide first
             # Only set them if router determines it's an analysis request
@@ -135,11 +201,9 @@ class UnifiedOrchestrator:
                 "chat_id": chat_id,
                 "project_id": project_id,
                 "repo_path": repo_path,
-                "codebase_structure": codebase_structure,
                 "message": message,
                 "conversation_history": conversation_history,
                 "analysis_context": analysis_context,
-                "recipe_id": None,  # No longer used
                 "query": query,  # Only set if explicitly provided (not from message)
                 "requirement": requirement,  # Only set if explicitly provided (not from message)
                 "context": context,
@@ -151,12 +215,24 @@ class UnifiedOrchestrator:
                 "rough_estimate": {},
                 "task_breakdown": {},
                 "codex_analysis": "",  # Will be populated by prepare_analysis_node
+                "codex_fingerprint": None,
                 "response": None,
                 "messages": []
             }
             
+            # With checkpoints, each chat is its own thread; standalone analyses have nothing
+            # to resume, so they run on a graph that never writes checkpoints
+            graph = self.stateless_graph
+            config = None
+            if chat_id and self.graph.checkpointer is not None:
+                graph = self.graph
+                config = {"configurable": {"thread_id": f"chat-{chat_id}"}}
+                # Keep the checkpointed Codex analysis; prepare_analysis_node re-checks its fingerprint
+                del initial_state["codex_analysis"]
+                del initial_state["codex_fingerprint"]
+            
             # Run the unified workflow
-            final_state = self.graph.invoke(initial_state)
+            final_state = await graph.ainvoke(initial_state, config=config)
             
             # Build response based on request type
             request_type = final_state.get("request_type", "chat")
@@ -170,53 +246,39 @@ class UnifiedOrchestrator:
                 result["chat_id"] = chat_id
                 
                 # Update chat history in database
-                if chat_id and db:
-                    chat = db.query(Chat).filter(Chat.id == chat_id).first()
-                    if chat:
-                        updated_history = final_state.get("conversation_history", [])
-                        # Truncate history before saving to prevent unbounded growth
-                        if len(updated_history) > MAX_CONVERSATION_HISTORY_MESSAGES:
-                            updated_history = updated_history[-MAX_CONVERSATION_HISTORY_MESSAGES:]
-                            logger.info(
-                                f"Truncated conversation history to {len(updated_history)} messages "
-                                f"before saving for chat_id {chat_id}"
-                            )
-                        chat.conversation_history = json.dumps(updated_history)
-                        db.commit()
-                        logger.info(f"Updated chat history for chat_id {chat_id}")
+                if chat:
+                    # The chat node keeps history bounded, so it is saved as-is
+                    chat.conversation_history = list(final_state.get("conversation_history", []))
+                    logger.info("Updated chat history for chat_id %s", chat_id)
             
             elif request_type == "feature_analysis":
-                result["high_level_design"] = final_state.get("high_level_design")
-                result["feature_details"] = final_state.get("feature_details")
+                high_level_design = final_state.get("high_level_design")
+                feature_details = final_state.get("feature_details")
+                result["high_level_design"] = high_level_design
+                result["feature_details"] = feature_details
                 
                 # Use effective query (could be from message or explicit query)
                 effective_query = query or message or ""
                 
                 # Create chat session for follow-up (or update existing if from chat)
                 if db:
-                    analysis_context = f"""
-Query: {effective_query}
-
-Feature Overview:
-{final_state.get("high_level_design", "")}
-
-Feature Details:
-{final_state.get("feature_details", "")}
-"""
+                    analysis_context = FEATURE_CONTEXT_TMPL.format(
+                        query=effective_query,
+                        high_level_design=high_level_design or "",
+                        feature_details=feature_details or ""
+                    )
                     # If triggered from existing chat, update that chat with new analysis context
                     # Otherwise create new chat
                     if chat_id:
                         # Update existing chat with new analysis
-                        chat = db.query(Chat).filter(Chat.id == chat_id).first()
                         if chat:
                             chat.analysis_context = analysis_context
                             chat.analysis_type = "feature"
-                            db.commit()
                             result["chat_id"] = chat_id
-                            logger.info(f"Updated chat {chat_id} with new feature analysis")
+                            logger.info("Updated chat %s with new feature analysis", chat_id)
                     else:
                         # Create new chat session
-                        result["chat_id"] = _create_chat_session(
+                        result["chat_id"] = _stage_chat_session(
                             db=db,
                             project_id=project_id,
                             analysis_type="feature",
@@ -224,11 +286,16 @@ Feature Details:
                         )
             
             elif request_type == "feasibility_analysis":
-                result["high_level_design"] = final_state.get("high_level_design")
-                result["risks"] = final_state.get("risks", [])
-                result["open_questions"] = final_state.get("open_questions", [])
-                result["technical_feasibility"] = final_state.get("technical_feasibility")
-                result["rough_estimate"] = final_state.get("rough_estimate", {})
+                high_level_design = final_state.get("high_level_design")
+                risks = final_state.get("risks") or []
+                open_questions = final_state.get("open_questions") or []
+                technical_feasibility = final_state.get("technical_feasibility")
+                rough_estimate = final_state.get("rough_estimate") or {}
+                result["high_level_design"] = high_level_design
+                result["risks"] = risks
+                result["open_questions"] = open_questions
+                result["technical_feasibility"] = technical_feasibility
+                result["rough_estimate"] = rough_estimate
                 result["task_breakdown"] = final_state.get("task_breakdown", {})
                 
                 # Use effective requirement (could be from message or explicit requirement)
@@ -236,45 +303,57 @@ Feature Details:
                 
                 # Create chat session for follow-up (or update existing if from chat)
                 if db:
-                    analysis_context = f"""
-Requirement: {effective_requirement}
-Context: {context or "None provided"}
-
-High-Level Approach:
-{final_state.get("high_level_design", "")}
-
-Feasibility: {final_state.get("technical_feasibility", "Unknown")}
-
-Risks:
-{chr(10).join(f"- {risk}" for risk in final_state.get("risks", []))}
-
-Open Questions:
-{chr(10).join(f"- {q}" for q in final_state.get("open_questions", []))}
-
-Estimate: {final_state.get("rough_estimate", {})}
-"""
+                    analysis_context = FEASIBILITY_CONTEXT_TMPL.format_map({
+                        "requirement": effective_requirement,
+                        "context": context or "None provided",
+                        "high_level_design": high_level_design or "",
+                        "technical_feasibility": technical_feasibility or "Unknown",
+                        "risks_block": "\n".join(["- " + risk for risk in risks]),
+                        "questions_block": "\n".join(["- " + q for q in open_questions]),
+                        "rough_estimate": rough_estimate,
+                    })
                     # If triggered from existing chat, update that chat with new analysis context
                     # Otherwise create new chat
                     if chat_id:
                         # Update existing chat with new analysis
-                        chat = db.query(Chat).filter(Chat.id == chat_id).first()
                         if chat:
                             chat.analysis_context = analysis_context
                             chat.analysis_type = "feasibility"
-                            db.commit()
                             result["chat_id"] = chat_id
-                            logger.info(f"Updated chat {chat_id} with new feasibility analysis")
+                            logger.info("Updated chat %s with new feasibility analysis", chat_id)
                     else:
                         # Create new chat session
-                        result["chat_id"] = _create_chat_session(
+                        result["chat_id"] = _stage_chat_session(
                             db=db,
                             project_id=project_id,
                             analysis_type="feasibility",
                             analysis_context=analysis_context
                         )
             
+            # All chat updates above are persisted in a single transaction
+            if db:
+                db.commit()
+            
             return result
             
         except Exception as e:
-            logger.error(f"Error in unified orchestrator: {str(e)}", exc_info=True)
+            logger.error("Error in unified orchestrator: %s", e, exc_info=True)
+            if db:
+                db.rollback()
             raise
+    
+    async def aclose(self) -> None:
+        """Close the checkpoint database connection, if checkpointing is enabled."""
+        if self._checkpoint_conn is not None:
+            await self._checkpoint_conn.close()
+
+
+@functools.lru_cache(maxsize=1)
+def get_orchestrator() -> UnifiedOrchestrator:
+    """
+    Get the process-wide UnifiedOrchestrator (FastAPI dependency).
+    
+    Returns:
+        Shared UnifiedOrchestrator (created on first call)
+    """
+    return UnifiedOrchestrator()
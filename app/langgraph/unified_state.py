@@ -2,7 +2,15 @@
 Unified state schema for routing between chat and analysis agents
 """
 
-from typing import Dict, Any, List, TypedDict, Optional, Literal
+from typing import Annotated, Dict, Any, List, TypedDict, Optional, Literal
+
+# Upper bound on the graph's message log
+MAX_STATE_MESSAGES = 100
+
+
+def _append_bounded(existing: List[str], new: List[str]) -> List[str]:
+    """Reducer for messages: append the node's new messages, keeping only the most recent ones."""
+    return (list(existing or []) + list(new or []))[-MAX_STATE_MESSAGES:]
 
 
 class UnifiedAgentState(TypedDict):
@@ -14,7 +22,6 @@ class UnifiedAgentState(TypedDict):
     # Common fields
     project_id: str
     repo_path: Optional[str]
-    codebase_structure: Dict[str, Any]
     
     # Chat-specific fields
     message: Optional[str]
@@ -22,7 +29,6 @@ class UnifiedAgentState(TypedDict):
     analysis_context: Optional[str]
     
     # Feature analysis fields
-    recipe_id: Optional[int]  # Deprecated - kept for backward compatibility only, always None
     query: Optional[str]
     high_level_design: Optional[str]
     feature_details: Optional[str]
@@ -38,8 +44,9 @@ class UnifiedAgentState(TypedDict):
     
     # Codex analysis (shared)
     codex_analysis: str
+    codex_fingerprint: Optional[str]  # Repo HEAD + Codex query the analysis was produced for
     
     # Response
     response: Optional[str]
-    messages: List[str]
+    messages: Annotated[List[str], _append_bounded]  # Nodes return only new messages; LangGraph appends them
 
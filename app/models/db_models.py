@@ -2,8 +2,8 @@
 SQLAlchemy database models
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import JSON, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.models.database import Base
@@ -25,41 +25,24 @@ class Project(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # recipes relationship removed - kept Recipe model for backward compatibility only
     chats = relationship("Chat", back_populates="project", cascade="all, delete-orphan")
     feasibilities = relationship("Feasibility", back_populates="project", cascade="all, delete-orphan")
     features = relationship("ProjectFeature", back_populates="project", cascade="all, delete-orphan")
 
 
-class Recipe(Base):
-    """Recipe model - DEPRECATED: Kept for backward compatibility only. Use ProjectFeature instead."""
-    __tablename__ = "recipes"
-
-    id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(String(255), ForeignKey("projects.project_id"), nullable=False)
-    recipe_name = Column(String(255), nullable=False)
-    description = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-
-    # Relationships removed - kept model for backward compatibility only
-
-
 class Chat(Base):
     """Chat model - represents a conversation session for follow-up questions"""
     __tablename__ = "chats"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(String(255), ForeignKey("projects.project_id"), nullable=True)
-    recipe_id = Column(Integer, ForeignKey("recipes.id"), nullable=True)
+    project_id = Column(String(255), ForeignKey("projects.project_id"), nullable=True, index=True)
     analysis_type = Column(String(50), nullable=False)  # 'feasibility', 'feature', or 'project_feature'
     analysis_context = Column(Text, nullable=True)  # Store the original analysis for context
-    conversation_history = Column(Text, nullable=True)  # JSON string of conversation messages
+    conversation_history = Column(JSONB, nullable=True, server_default="[]")  # List of conversation messages
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     project = relationship("Project")
-    # recipe relationship removed - recipe_id column kept for backward compatibility only
     feasibilities = relationship("Feasibility", back_populates="chat", cascade="all, delete-orphan")
     features = relationship("ProjectFeature", back_populates="chat", cascade="all, delete-orphan")
 
@@ -67,6 +50,10 @@ class Chat(Base):
 class Feasibility(Base):
     """Feasibility model - stores feasibility analysis results"""
     __tablename__ = "feasibilities"
+    # Serves both project_id lookups and the per-project "newest first" listing
+    __table_args__ = (
+        Index("ix_feasibilities_project_id_analysis_timestamp", "project_id", "analysis_timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(String(255), ForeignKey("projects.project_id"), nullable=False)
@@ -79,7 +66,8 @@ class Feasibility(Base):
     technical_feasibility = Column(String(100), nullable=True)
     rough_estimate = Column(JSON, nullable=True)  # Dict[str, Any]
     task_breakdown = Column(JSON, nullable=True)  # Dict[str, Any]
-    analysis_timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Stamped by the database (in UTC, like the Python-side utcnow defaults) and read back via RETURNING
+    analysis_timestamp = Column(DateTime, server_default=text("timezone('utc', now())"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -90,6 +78,10 @@ class Feasibility(Base):
 class ProjectFeature(Base):
     """ProjectFeature model - stores discovered features from codebase analysis"""
     __tablename__ = "project_features"
+    # Serves the per-project "newest first" listing (and its MAX/COUNT version stamp) as an index range scan
+    __table_args__ = (
+        Index("ix_project_features_project_id_discovery_timestamp", "project_id", "discovery_timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(String(255), ForeignKey("projects.project_id"), nullable=False, index=True)
@@ -1,8 +1,9 @@
 """
 Pydantic schemas for API requests/responses
+Response schemas use defer_build so their validators are only built when first used.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -29,28 +30,7 @@ class ProjectResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
-
-class RecipeCreate(BaseModel):
-    """DEPRECATED: Schema for creating a recipe - kept for backward compatibility only"""
-    project_id: str = Field(..., description="Project identifier")
-    recipe_name: str = Field(..., description="Recipe/feature name")
-    description: Optional[str] = Field(None, description="Recipe description")
-
-
-class RecipeResponse(BaseModel):
-    """DEPRECATED: Schema for recipe response - kept for backward compatibility only"""
-    id: int
-    project_id: str
-    recipe_name: str
-    description: Optional[str]
-    created_at: datetime
-    updated_at: datetime
-
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class FeatureQueryRequest(BaseModel):
@@ -60,13 +40,14 @@ class FeatureQueryRequest(BaseModel):
 
 class FeatureQueryResponse(BaseModel):
     """DEPRECATED: Schema for feature query response - kept for backward compatibility only"""
-    recipe_id: Optional[int] = Field(None, description="Deprecated - always None")
     query: str
     high_level_design: str
     feature_details: str
     analysis_timestamp: datetime
     chat_id: Optional[int] = Field(None, description="Chat ID for follow-up conversations")
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class FeasibilityQueryRequest(BaseModel):
     """Schema for feasibility query request"""
@@ -80,6 +61,8 @@ class ChatMessage(BaseModel):
     content: str = Field(..., description="Message content")
     timestamp: Optional[datetime] = Field(None, description="Message timestamp")
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class FeasibilityQueryResponse(BaseModel):
     """Schema for feasibility query response"""
@@ -96,6 +79,8 @@ class FeasibilityQueryResponse(BaseModel):
     chat_id: Optional[int] = Field(None, description="Chat ID for follow-up conversations")
     chat_history: Optional[List[ChatMessage]] = Field(None, description="Conversation history for this feasibility analysis")
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class ChatMessageRequest(BaseModel):
     """Schema for sending a chat message"""
@@ -109,6 +94,8 @@ class ChatMessageResponse(BaseModel):
     response: str
     timestamp: datetime
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class ProjectFeatureResponse(BaseModel):
     """Schema for project feature response"""
@@ -124,8 +111,7 @@ class ProjectFeatureResponse(BaseModel):
     chat_id: Optional[int] = Field(None, description="Chat ID for follow-up conversations")
     chat_history: Optional[List[ChatMessage]] = Field(None, description="Conversation history for this feature")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class FeatureDiscoveryRequest(BaseModel):
@@ -147,6 +133,5 @@ class ChatResponse(BaseModel):
     analysis_type: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
@@ -2,9 +2,9 @@
 Chat API router - Now uses unified orchestrator for all chat operations
 """
 
-import json
 import logging
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import List
@@ -16,7 +16,7 @@ from app.models.schemas import (
     ChatMessageResponse,
     ChatMessage
 )
-from app.langgraph.unified_orchestrator import UnifiedOrchestrator
+from app.langgraph.unified_orchestrator import UnifiedOrchestrator, get_orchestrator
 
 router = APIRouter(prefix="/chats", tags=["Chats"])
 logger = logging.getLogger(__name__)
@@ -26,14 +26,15 @@ logger = logging.getLogger(__name__)
 async def send_message(
     chat_id: int,
     request: ChatMessageRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    orchestrator: UnifiedOrchestrator = Depends(get_orchestrator)
 ):
     """
     Send a message in a chat session and get a response using unified orchestrator.
     """
     try:
         # Get chat to retrieve project_id
-        chat = db.query(Chat).filter(Chat.id == chat_id).first()
+        chat = db.get(Chat, chat_id)
         if not chat:
             raise HTTPException(status_code=404, detail=f"Chat '{chat_id}' not found")
         
@@ -41,8 +42,7 @@ async def send_message(
             raise HTTPException(status_code=400, detail="Chat must be associated with a project")
         
         # Use unified orchestrator for chat
-        orchestrator = UnifiedOrchestrator()
-        result = orchestrator.run(
+        result = await orchestrator.run(
             project_id=chat.project_id,
             chat_id=chat_id,
             message=request.message,
@@ -63,8 +63,8 @@ async def send_message(
         raise HTTPException(status_code=500, detail=f"Error sending message: {str(e)}")
 
 
-@router.get("/{chat_id}/history", response_model=List[ChatMessage])
-async def get_chat_history(
+@router.get("/{chat_id}/history", response_model=List[ChatMessage], response_class=ORJSONResponse)
+def get_chat_history(
     chat_id: int,
     db: Session = Depends(get_db)
 ):
@@ -72,27 +72,27 @@ async def get_chat_history(
     Get the conversation history for a chat.
     """
     try:
-        chat = db.query(Chat).filter(Chat.id == chat_id).first()
+        chat = db.get(Chat, chat_id)
         if not chat:
             raise HTTPException(status_code=404, detail=f"Chat '{chat_id}' not found")
         
+        # Stored timestamps are already ISO strings, so messages are emitted as-is
         conversation_history = []
         if chat.conversation_history:
             try:
-                history_data = json.loads(chat.conversation_history)
                 conversation_history = [
-                    ChatMessage(
-                        role=msg.get("role", "user"),
-                        content=msg.get("content", ""),
-                        timestamp=datetime.fromisoformat(msg["timestamp"]) if msg.get("timestamp") else None
-                    )
-                    for msg in history_data
+                    {
+                        "role": msg.get("role", "user"),
+                        "content": msg.get("content", ""),
+                        "timestamp": msg.get("timestamp")
+                    }
+                    for msg in chat.conversation_history
                 ]
-            except (json.JSONDecodeError, KeyError, ValueError) as e:
+            except AttributeError as e:
                 logger.warning(f"Error parsing chat history: {str(e)}")
                 conversation_history = []
         
-        return conversation_history
+        return ORJSONResponse(conversation_history)
         
     except HTTPException:
         raise
@@ -2,20 +2,36 @@
 Health check router
 """
 
-from fastapi import APIRouter
+import time
+from fastapi import APIRouter, Response
 from datetime import datetime
 
+import orjson
+
 router = APIRouter(tags=["Health"])
 
+# Pre-rendered response body, refreshed at most once per second (see _health_body)
+_cached_body = b""
+_cached_second = -1
+
+
+def _health_body() -> bytes:
+    """Health check JSON body; the timestamp has one-second resolution so the body is reused within a second."""
+    global _cached_body, _cached_second
+    now = int(time.time())
+    if now != _cached_second:
+        _cached_body = orjson.dumps({
+            "status": "healthy",
+            "timestamp": datetime.utcfromtimestamp(now).isoformat(),
+            "service": "product-assistant-api"
+        })
+        _cached_second = now
+    return _cached_body
+
 
 @router.get("/health")
 async def health_check():
     """
     Health check endpoint.
     """
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "service": "product-assistant-api"
-    }
-
+    return Response(content=_health_body(), media_type="application/json")
@@ -2,18 +2,25 @@
 Projects API router
 """
 
-import json
+import asyncio
+import hashlib
 import logging
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+import time
+from collections import OrderedDict
+from uuid import uuid4
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, func, insert, lambda_stmt, select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
 from app.models.database import get_db
 from app.models.db_models import Project, Feasibility, Chat, ProjectFeature
 from app.models.schemas import ProjectCreate, ProjectResponse
 from app.services.git_service import GitService
-from app.langgraph.unified_orchestrator import UnifiedOrchestrator
+from app.langgraph.unified_orchestrator import UnifiedOrchestrator, get_orchestrator
 from app.models.schemas import (
     FeasibilityQueryRequest, FeasibilityQueryResponse, ChatMessage,
     ProjectFeatureResponse, FeatureDiscoveryRequest, ChatMessageRequest, ChatMessageResponse
@@ -21,15 +28,228 @@ from app.models.schemas import (
 from app.services.feature_discovery_service import FeatureDiscoveryService
 from app.services.project_summary_service import ProjectSummaryService
 from app.utils import ensure_repo_exists
+from app.config import PROJECT_RESPONSE_CACHE_TTL_SECONDS
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 git_service = GitService()
 
+# Rendered project list/detail bodies: cache key -> (expires_at, JSON bytes, headers).
+# Bounded LRU, local to this worker process; other workers keep their own copies and
+# only see writes made elsewhere once their entries expire.
+_response_cache: "OrderedDict[str, Tuple[float, bytes, Dict[str, str]]]" = OrderedDict()
+_RESPONSE_CACHE_SIZE = 256
 
-@router.post("", response_model=ProjectResponse, status_code=201)
-async def create_project(
+
+def _etag(*parts: Any) -> str:
+    """Strong ETag value derived from the given parts."""
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode("utf-8"), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """True if the client's If-None-Match already names this ETag."""
+    return request.headers.get("if-none-match") == etag
+
+
+def _cached_json_response(
+    key: str,
+    build: Callable[[], Any],
+    headers_for: Optional[Callable[[Any], Dict[str, str]]] = None,
+    request: Optional[Request] = None
+) -> Response:
+    """
+    Serve a JSON response from the per-process cache, rendering it with build() on a miss.
+    Responses carry an ETag of the body; a matching If-None-Match gets a 304.
+    
+    Args:
+        key: Cache key
+        build: Returns the JSON-serializable content
+        headers_for: Optional function deriving response headers from the content
+        request: Incoming request, for conditional GETs
+        
+    Returns:
+        JSON response (or an empty 304 response)
+    """
+    now = time.monotonic()
+    entry = _response_cache.get(key)
+    if entry and entry[0] > now:
+        _response_cache.move_to_end(key)
+        body, headers = entry[1], entry[2]
+    else:
+        _response_cache.pop(key, None)
+        content = build()
+        body = orjson.dumps(content)
+        headers = headers_for(content) if headers_for else {}
+        headers["ETag"] = _etag(body)
+        if PROJECT_RESPONSE_CACHE_TTL_SECONDS > 0:
+            _response_cache[key] = (now + PROJECT_RESPONSE_CACHE_TTL_SECONDS, body, headers)
+            while len(_response_cache) > _RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+    if request is not None and _not_modified(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Parsed chat histories: (chat id, chat updated_at) -> messages; edits bump updated_at
+_chat_history_cache: "OrderedDict[Tuple[int, Optional[datetime]], List[ChatMessage]]" = OrderedDict()
+_CHAT_HISTORY_CACHE_SIZE = 1024
+
+
+def _chat_history(chat: Optional[Chat]) -> Optional[List[ChatMessage]]:
+    """
+    ChatMessage list for a chat's stored conversation history, memoized per chat version.
+    
+    Args:
+        chat: Chat row (or None)
+        
+    Returns:
+        Parsed messages, None if the chat has no history, or [] if it could not be parsed
+    """
+    if not chat or not chat.conversation_history:
+        return None
+    key = (chat.id, chat.updated_at)
+    cached = _chat_history_cache.get(key)
+    if cached is not None:
+        _chat_history_cache.move_to_end(key)
+        return cached
+    try:
+        history = [
+            ChatMessage(
+                role=msg.get("role", "user"),
+                content=msg.get("content", ""),
+                timestamp=datetime.fromisoformat(msg["timestamp"]) if msg.get("timestamp") else None
+            )
+            for msg in chat.conversation_history
+        ]
+    except (AttributeError, KeyError, ValueError) as e:
+        logger.warning(f"Error parsing chat history for chat_id {chat.id}: {str(e)}")
+        return []
+    _chat_history_cache[key] = history
+    if len(_chat_history_cache) > _CHAT_HISTORY_CACHE_SIZE:
+        _chat_history_cache.popitem(last=False)
+    return history
+
+
+def _invalidate_project_responses() -> None:
+    """Drop cached project responses (call after creating or updating a project)."""
+    _response_cache.clear()
+
+
+def _get_project(db: Session, project_id: str) -> Optional[Project]:
+    """Project row for project_id, or None; the lambda statement is built and compiled once and reused."""
+    stmt = lambda_stmt(lambda: select(Project).where(Project.project_id == project_id))
+    return db.execute(stmt).scalar_one_or_none()
+
+
+# Columns selected for project listings, in ProjectResponse field order
+_PROJECT_COLUMNS = (
+    Project.id, Project.project_id, Project.project_name, Project.github_repo, Project.repo_path,
+    Project.description, Project.summary, Project.purpose, Project.tech_stack,
+    Project.created_at, Project.updated_at,
+)
+_PROJECT_KEYS = tuple(column.key for column in _PROJECT_COLUMNS)
+
+# Per-project feasibility/feature statements, built once; values are bound per call
+_FEASIBILITY_STAMP_STMT = (
+    select(func.max(Feasibility.analysis_timestamp), func.count())
+    .where(Feasibility.project_id == bindparam("project_id"))
+)
+_FEASIBILITY_LIST_STMT = (
+    select(Feasibility)
+    .where(Feasibility.project_id == bindparam("project_id"))
+    .order_by(Feasibility.analysis_timestamp.desc())
+)
+_FEASIBILITY_WITH_CHAT_STMT = (
+    select(Feasibility, Chat)
+    .outerjoin(Chat, Chat.id == Feasibility.chat_id)
+    .where(Feasibility.id == bindparam("item_id"), Feasibility.project_id == bindparam("project_id"))
+)
+_FEATURE_STAMP_STMT = (
+    select(func.max(ProjectFeature.discovery_timestamp), func.count())
+    .where(ProjectFeature.project_id == bindparam("project_id"))
+)
+_FEATURE_LIST_STMT = (
+    select(ProjectFeature)
+    .where(ProjectFeature.project_id == bindparam("project_id"))
+    .order_by(ProjectFeature.discovery_timestamp.desc())
+)
+_FEATURE_WITH_CHAT_STMT = (
+    select(ProjectFeature, Chat)
+    .outerjoin(Chat, Chat.id == ProjectFeature.chat_id)
+    .where(ProjectFeature.id == bindparam("item_id"), ProjectFeature.project_id == bindparam("project_id"))
+)
+
+
+def get_project_or_404(project_id: str, db: Session = Depends(get_db)) -> Project:
+    """
+    Dependency resolving the project_id path parameter to its Project row.
+    
+    Args:
+        project_id: Project identifier from the path
+        db: Database session (shared with the handler within a request)
+        
+    Returns:
+        Project row
+        
+    Raises:
+        HTTPException: 404 if the project does not exist
+    """
+    project = _get_project(db, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail=f"Project '{project_id}' not found")
+    return project
+
+
+# project_ids confirmed to exist -> expires_at; read endpoints that only need the 404 check use it
+_known_project_ids: Dict[str, float] = {}
+_KNOWN_PROJECT_IDS_MAX = 4096
+
+
+def require_project(project_id: str, db: Session = Depends(get_db)) -> None:
+    """
+    Dependency that 404s unknown project_ids, skipping the query for recently confirmed ones.
+    Only hits are cached, so a newly created project is never reported missing.
+    
+    Args:
+        project_id: Project identifier from the path
+        db: Database session
+        
+    Raises:
+        HTTPException: 404 if the project does not exist
+    """
+    now = time.monotonic()
+    expires_at = _known_project_ids.get(project_id)
+    if expires_at and expires_at > now:
+        return
+    if not db.execute(lambda_stmt(lambda: select(Project.id).where(Project.project_id == project_id))).first():
+        raise HTTPException(status_code=404, detail=f"Project '{project_id}' not found")
+    if PROJECT_RESPONSE_CACHE_TTL_SECONDS > 0:
+        if len(_known_project_ids) >= _KNOWN_PROJECT_IDS_MAX:
+            _known_project_ids.clear()
+        _known_project_ids[project_id] = now + PROJECT_RESPONSE_CACHE_TTL_SECONDS
+
+
+def _project_dict(project: Project) -> Dict[str, Any]:
+    """Plain-dict form of a Project row, shaped like ProjectResponse."""
+    return {
+        "id": project.id,
+        "project_id": project.project_id,
+        "project_name": project.project_name,
+        "github_repo": project.github_repo,
+        "repo_path": project.repo_path,
+        "description": project.description,
+        "summary": project.summary,
+        "purpose": project.purpose,
+        "tech_stack": project.tech_stack,
+        "created_at": project.created_at,
+        "updated_at": project.updated_at,
+    }
+
+
+@router.post("", response_model=ProjectResponse, status_code=201, response_class=ORJSONResponse)
+def create_project(
     project_data: ProjectCreate,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
@@ -40,16 +260,14 @@ async def create_project(
     Feature discovery runs automatically in the background after project creation.
     """
     try:
-        import uuid
-        
         # Auto-generate project_id if not provided
         project_id = project_data.project_id
         if not project_id:
             # Generate a unique project_id based on UUID
-            project_id = str(uuid.uuid4())
+            project_id = str(uuid4())
         else:
             # Check if custom project_id already exists
-            existing_project = db.query(Project).filter(Project.project_id == project_id).first()
+            existing_project = _get_project(db, project_id)
             if existing_project:
                 raise HTTPException(status_code=400, detail=f"Project with ID '{project_id}' already exists")
         
@@ -67,6 +285,7 @@ async def create_project(
         db.add(db_project)
         db.commit()
         db.refresh(db_project)
+        _invalidate_project_responses()
         
         # Trigger project summary generation in background
         background_tasks.add_task(
@@ -86,42 +305,59 @@ async def create_project(
         )
         logger.info(f"Started background feature discovery for project {project_id}")
 
-        return db_project
+        # Returned directly, so the decorator's status code is set here too; background tasks still run
+        return ORJSONResponse(_project_dict(db_project), status_code=201)
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating project: {str(e)}")
 
 
-@router.get("", response_model=List[ProjectResponse])
-async def list_projects(
+@router.get("", response_model=List[ProjectResponse], response_class=ORJSONResponse)
+def list_projects(
+    request: Request,
+    cursor: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db)
 ):
     """
-    List all projects.
+    List projects, one page at a time.
+    Pages are keyed on the project row id: pass the X-Next-Cursor header value of one
+    response as `cursor` to fetch the next page. The header is absent on the last page.
     """
+    def build() -> List[Dict[str, Any]]:
+        # Plain column tuples: no ORM instances or identity-map bookkeeping per row
+        stmt = select(*_PROJECT_COLUMNS).where(Project.id > (cursor or 0)).order_by(Project.id).limit(limit)
+        return [dict(zip(_PROJECT_KEYS, row)) for row in db.execute(stmt)]
+
+    def headers_for(items: List[Dict[str, Any]]) -> Dict[str, str]:
+        return {"X-Next-Cursor": str(items[-1]["id"])} if len(items) == limit else {}
+
     try:
-        projects = db.query(Project).all()
-        return projects
+        # Rows are trusted; serialize directly instead of re-validating through ProjectResponse
+        return _cached_json_response(f"projects:{cursor or 0}:{limit}", build, headers_for, request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing projects: {str(e)}")
 
 
-@router.get("/{project_id}", response_model=ProjectResponse)
-async def get_project(
+@router.get("/{project_id}", response_model=ProjectResponse, response_class=ORJSONResponse)
+def get_project(
     project_id: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Get a specific project by project_id.
     """
     try:
-        project = db.query(Project).filter(Project.project_id == project_id).first()
-        if not project:
-            raise HTTPException(status_code=404, detail=f"Project '{project_id}' not found")
-        return project
+        def build() -> Dict[str, Any]:
+            project = _get_project(db, project_id)
+            if not project:
+                raise HTTPException(status_code=404, detail=f"Project '{project_id}' not found")
+            return _project_dict(project)
+        
+        return _cached_json_response(f"project:{project_id}", build, request=request)
     except HTTPException:
         raise
     except Exception as e:
@@ -132,52 +368,48 @@ async def get_project(
 async def analyze_feasibility(
     project_id: str,
     request: FeasibilityQueryRequest,
-    db: Session = Depends(get_db)
+    project: Project = Depends(get_project_or_404),
+    db: Session = Depends(get_db),
+    orchestrator: UnifiedOrchestrator = Depends(get_orchestrator)
 ):
     """
     Analyze feasibility of a new requirement for a project.
     """
     try:
-        # Get project
-        project = db.query(Project).filter(Project.project_id == project_id).first()
-        if not project:
-            raise HTTPException(status_code=404, detail=f"Project '{project_id}' not found")
-        
-        # Ensure repository exists (re-clone if needed)
-        ensure_repo_exists(project, db)
+        # Ensure repository exists (re-clone if needed); a clone can take seconds, so keep it off the event loop
+        repo_path = await asyncio.to_thread(ensure_repo_exists, project, db)
 
         # Run feasibility analysis using unified orchestrator
-        orchestrator = UnifiedOrchestrator()
-        result = orchestrator.run(
+        result = await orchestrator.run(
             project_id=project_id,
             requirement=request.requirement,
             context=request.context or "",
+            repo_path=repo_path,
             db=db
         )
         
         # Persist feasibility to database
         chat_id = result.get("chat_id")
-        analysis_timestamp = datetime.utcnow()
         
-        db_feasibility = Feasibility(
-            project_id=project_id,
-            chat_id=chat_id,
-            requirement=request.requirement,
-            context=request.context or "",
-            high_level_design=result.get("high_level_design", ""),
-            risks=result.get("risks", []),
-            open_questions=result.get("open_questions", []),
-            technical_feasibility=result.get("technical_feasibility", "Unknown"),
-            rough_estimate=result.get("rough_estimate", {}),
-            task_breakdown=result.get("task_breakdown", {}),
-            analysis_timestamp=analysis_timestamp
-        )
-        db.add(db_feasibility)
+        # INSERT ... RETURNING gives back the new id and the server-stamped timestamp without a refresh() SELECT
+        feasibility_id, analysis_timestamp = db.execute(
+            insert(Feasibility).values(
+                project_id=project_id,
+                chat_id=chat_id,
+                requirement=request.requirement,
+                context=request.context or "",
+                high_level_design=result.get("high_level_design", ""),
+                risks=result.get("risks", []),
+                open_questions=result.get("open_questions", []),
+                technical_feasibility=result.get("technical_feasibility", "Unknown"),
+                rough_estimate=result.get("rough_estimate", {}),
+                task_breakdown=result.get("task_breakdown", {})
+            ).returning(Feasibility.id, Feasibility.analysis_timestamp)
+        ).one()
         db.commit()
-        db.refresh(db_feasibility)
         
         return FeasibilityQueryResponse(
-            feasibility_id=db_feasibility.id,
+            feasibility_id=feasibility_id,
             project_id=project_id,
             requirement=request.requirement,
             high_level_design=result.get("high_level_design", ""),
@@ -193,51 +425,55 @@ async def analyze_feasibility(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Error analyzing feasibility: {str(e)}")
 
 
-@router.get("/{project_id}/feasibilities", response_model=List[FeasibilityQueryResponse])
-async def get_feasibilities(
+@router.get("/{project_id}/feasibilities", response_model=List[FeasibilityQueryResponse], dependencies=[Depends(require_project)])
+def get_feasibilities(
     project_id: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Get all feasibility analyses for a project.
     """
     try:
-        # Verify project exists
-        project = db.query(Project).filter(Project.project_id == project_id).first()
-        if not project:
-            raise HTTPException(status_code=404, detail=f"Project '{project_id}' not found")
+        # Cheap version stamp first: polling clients that already have this list get a 304
+        latest, count = db.execute(_FEASIBILITY_STAMP_STMT, {"project_id": project_id}).one()
+        etag = _etag(project_id, latest, count)
+        if _not_modified(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
         
         # Get all feasibilities for this project
-        feasibilities = db.query(Feasibility).filter(Feasibility.project_id == project_id).order_by(Feasibility.analysis_timestamp.desc()).all()
+        feasibilities = db.execute(_FEASIBILITY_LIST_STMT, {"project_id": project_id}).scalars().all()
         
-        return [
-            FeasibilityQueryResponse(
-                feasibility_id=feasibility.id,
-                project_id=feasibility.project_id,
-                requirement=feasibility.requirement,
-                high_level_design=feasibility.high_level_design or "",
-                risks=feasibility.risks or [],
-                open_questions=feasibility.open_questions or [],
-                technical_feasibility=feasibility.technical_feasibility or "Unknown",
-                rough_estimate=feasibility.rough_estimate or {},
-                task_breakdown=feasibility.task_breakdown or {},
-                analysis_timestamp=feasibility.analysis_timestamp,
-                chat_id=feasibility.chat_id
-            )
+        # Rows are trusted; render plain dicts shaped like FeasibilityQueryResponse in one orjson call
+        items = [
+            {
+                "feasibility_id": feasibility.id,
+                "project_id": feasibility.project_id,
+                "requirement": feasibility.requirement,
+                "high_level_design": feasibility.high_level_design or "",
+                "risks": feasibility.risks or [],
+                "open_questions": feasibility.open_questions or [],
+                "technical_feasibility": feasibility.technical_feasibility or "Unknown",
+                "rough_estimate": feasibility.rough_estimate or {},
+                "task_breakdown": feasibility.task_breakdown or {},
+                "analysis_timestamp": feasibility.analysis_timestamp,
+                "chat_id": feasibility.chat_id,
+                "chat_history": None,
+            }
             for feasibility in feasibilities
         ]
+        return Response(content=orjson.dumps(items), media_type="application/json", headers={"ETag": etag})
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving feasibilities: {str(e)}")
 
 
-@router.get("/{project_id}/feasibilities/{feasibility_id}", response_model=FeasibilityQueryResponse)
-async def get_feasibility(
+@router.get("/{project_id}/feasibilities/{feasibility_id}", response_model=FeasibilityQueryResponse, dependencies=[Depends(require_project)])
+def get_feasibility(
     project_id: str,
     feasibility_id: int,
     db: Session = Depends(get_db)
@@ -246,38 +482,17 @@ async def get_feasibility(
     Get a specific feasibility analysis by ID.
     """
     try:
-        # Verify project exists
-        project = db.query(Project).filter(Project.project_id == project_id).first()
-        if not project:
-            raise HTTPException(status_code=404, detail=f"Project '{project_id}' not found")
-        
-        # Get feasibility
-        feasibility = db.query(Feasibility).filter(
-            Feasibility.id == feasibility_id,
-            Feasibility.project_id == project_id
+        # Get feasibility together with its chat (if any) in one query
+        row = db.execute(
+            _FEASIBILITY_WITH_CHAT_STMT, {"item_id": feasibility_id, "project_id": project_id}
         ).first()
         
-        if not feasibility:
+        if not row:
             raise HTTPException(status_code=404, detail=f"Feasibility '{feasibility_id}' not found for project '{project_id}'")
+        feasibility, chat = row
         
-        # Load chat history if chat_id exists
-        chat_history = None
-        if feasibility.chat_id:
-            chat = db.query(Chat).filter(Chat.id == feasibility.chat_id).first()
-            if chat and chat.conversation_history:
-                try:
-                    history_data = json.loads(chat.conversation_history)
-                    chat_history = [
-                        ChatMessage(
-                            role=msg.get("role", "user"),
-                            content=msg.get("content", ""),
-                            timestamp=datetime.fromisoformat(msg["timestamp"]) if msg.get("timestamp") else None
-                        )
-                        for msg in history_data
-                    ]
-                except (json.JSONDecodeError, KeyError, ValueError) as e:
-                    logger.warning(f"Error parsing chat history for chat_id {feasibility.chat_id}: {str(e)}")
-                    chat_history = []
+        # Load chat history if the analysis has a chat
+        chat_history = _chat_history(chat)
         
         return FeasibilityQueryResponse(
             feasibility_id=feasibility.id,
@@ -344,26 +559,30 @@ def generate_project_summary_background_task(
         bg_db = SessionLocal()
         try:
             summary_service = ProjectSummaryService()
-            summary_service.generate_project_summary(
+            # Runs in the background-task threadpool, so it gets its own event loop
+            asyncio.run(summary_service.generate_project_summary(
                 project_id=project_id,
                 repo_path=repo_path,
                 project_name=project_name,
                 db=bg_db
-            )
+            ))
             logger.info(f"Background project summary generation completed for project {project_id}")
         except Exception as e:
             logger.error(f"Error in background project summary generation for project {project_id}: {str(e)}", exc_info=True)
         finally:
             bg_db.close()
+            # Summary, purpose and tech stack changed
+            _invalidate_project_responses()
     except Exception as e:
         logger.error(f"Error setting up background project summary generation: {str(e)}", exc_info=True)
 
 
 @router.post("/{project_id}/features/discover")
-async def discover_features(
+def discover_features(
     project_id: str,
     request: FeatureDiscoveryRequest,
     background_tasks: BackgroundTasks,
+    project: Project = Depends(get_project_or_404),
     db: Session = Depends(get_db)
 ):
     """
@@ -372,11 +591,6 @@ async def discover_features(
     Returns immediately with a status message. Features will be available via GET /projects/{project_id}/features once discovery completes.
     """
     try:
-        # Get project
-        project = db.query(Project).filter(Project.project_id == project_id).first()
-        if not project:
-            raise HTTPException(status_code=404, detail=f"Project '{project_id}' not found")
-        
         # Ensure repository exists
         ensure_repo_exists(project, db)
         
@@ -399,52 +613,54 @@ async def discover_features(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Error starting feature discovery: {str(e)}")
 
 
-@router.get("/{project_id}/features", response_model=List[ProjectFeatureResponse])
-async def get_features(
+@router.get("/{project_id}/features", response_model=List[ProjectFeatureResponse], dependencies=[Depends(require_project)])
+def get_features(
     project_id: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Get all discovered features for a project.
     """
     try:
-        # Verify project exists
-        project = db.query(Project).filter(Project.project_id == project_id).first()
-        if not project:
-            raise HTTPException(status_code=404, detail=f"Project '{project_id}' not found")
+        # Cheap version stamp first: polling clients (waiting on discovery) that already have this list get a 304
+        latest, count = db.execute(_FEATURE_STAMP_STMT, {"project_id": project_id}).one()
+        etag = _etag(project_id, latest, count)
+        if _not_modified(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
         
         # Get all features for this project
-        features = db.query(ProjectFeature).filter(
-            ProjectFeature.project_id == project_id
-        ).order_by(ProjectFeature.discovery_timestamp.desc()).all()
+        features = db.execute(_FEATURE_LIST_STMT, {"project_id": project_id}).scalars().all()
         
-        return [
-            ProjectFeatureResponse(
-                feature_id=feature.id,
-                project_id=feature.project_id,
-                feature_name=feature.feature_name,
-                high_level_overview=feature.high_level_overview,
-                scope=feature.scope,
-                dependencies=feature.dependencies or [],
-                key_considerations=feature.key_considerations or [],
-                limitations=feature.limitations or [],
-                discovery_timestamp=feature.discovery_timestamp,
-                chat_id=feature.chat_id
-            )
+        # Rows are trusted; render plain dicts shaped like ProjectFeatureResponse in one orjson call
+        items = [
+            {
+                "feature_id": feature.id,
+                "project_id": feature.project_id,
+                "feature_name": feature.feature_name,
+                "high_level_overview": feature.high_level_overview,
+                "scope": feature.scope,
+                "dependencies": feature.dependencies or [],
+                "key_considerations": feature.key_considerations or [],
+                "limitations": feature.limitations or [],
+                "discovery_timestamp": feature.discovery_timestamp,
+                "chat_id": feature.chat_id,
+                "chat_history": None,
+            }
             for feature in features
         ]
+        return Response(content=orjson.dumps(items), media_type="application/json", headers={"ETag": etag})
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving features: {str(e)}")
 
 
-@router.get("/{project_id}/features/{feature_id}", response_model=ProjectFeatureResponse)
-async def get_feature(
+@router.get("/{project_id}/features/{feature_id}", response_model=ProjectFeatureResponse, dependencies=[Depends(require_project)])
+def get_feature(
     project_id: str,
     feature_id: int,
     db: Session = Depends(get_db)
@@ -453,41 +669,20 @@ async def get_feature(
     Get a specific feature by ID.
     """
     try:
-        # Verify project exists
-        project = db.query(Project).filter(Project.project_id == project_id).first()
-        if not project:
-            raise HTTPException(status_code=404, detail=f"Project '{project_id}' not found")
-        
-        # Get feature
-        feature = db.query(ProjectFeature).filter(
-            ProjectFeature.id == feature_id,
-            ProjectFeature.project_id == project_id
+        # Get feature together with its chat (if any) in one query
+        row = db.execute(
+            _FEATURE_WITH_CHAT_STMT, {"item_id": feature_id, "project_id": project_id}
         ).first()
         
-        if not feature:
+        if not row:
             raise HTTPException(
                 status_code=404,
                 detail=f"Feature '{feature_id}' not found for project '{project_id}'"
             )
+        feature, chat = row
         
-        # Load chat history if chat_id exists
-        chat_history = None
-        if feature.chat_id:
-            chat = db.query(Chat).filter(Chat.id == feature.chat_id).first()
-            if chat and chat.conversation_history:
-                try:
-                    history_data = json.loads(chat.conversation_history)
-                    chat_history = [
-                        ChatMessage(
-                            role=msg.get("role", "user"),
-                            content=msg.get("content", ""),
-                            timestamp=datetime.fromisoformat(msg["timestamp"]) if msg.get("timestamp") else None
-                        )
-                        for msg in history_data
-                    ]
-                except (json.JSONDecodeError, KeyError, ValueError) as e:
-                    logger.warning(f"Error parsing chat history for chat_id {feature.chat_id}: {str(e)}")
-                    chat_history = []
+        # Load chat history if the analysis has a chat
+        chat_history = _chat_history(chat)
         
         return ProjectFeatureResponse(
             feature_id=feature.id,
@@ -3,29 +3,116 @@ Feature Discovery Service
 Discovers all features in a codebase and analyzes each one
 """
 
+import asyncio
+import functools
 import logging
 import re
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 from app.models.db_models import Project, ProjectFeature, Chat
 from app.langgraph.tools.codex_terminal_runner import (
-    run_codex_in_terminal,
+    run_codex_in_terminal_async,
     run_codex_raw_prompt,
 )
+from app.langgraph.tools.codex_cache import codex_cache_file, get_cached_analysis, set_cached_analysis
 from app.langgraph.nodes.feature_analysis_node import create_feature_analysis_node
 from app.langgraph.state import FeatureAnalysisState
-from app.services.gemini_client import GeminiClient
+from app.services.gemini_client import GeminiClient, get_gemini_client
+from app.config import FEATURE_DISCOVERY_CONCURRENCY
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 
+def _alternation(patterns) -> str:
+    """Regex alternation matching any of the literal patterns."""
+    return "|".join(re.escape(pattern) for pattern in patterns)
+
+
+# Feature-name filters, each compiled once into a single alternation (see _is_valid_feature_name)
+_CONVERSATIONAL_PREFIX_RE = re.compile(_alternation([
+    'please tell me', 'please', 'tell me', 'what is', 'what are', 'can you', 'could you',
+    'would you', 'how do', 'how does', 'i need', 'i want', 'show me', 'give me', 'help me',
+]))
+_STATUS_MESSAGE_RE = re.compile(_alternation([
+    'no user-facing features', 'no features detected', 'no features found', 'no feature',
+    'features not found', 'no capabilities', 'unable to find', 'cannot find',
+]))
+_INSTRUCTION_RE = re.compile(_alternation([
+    'numbered list', 'output format', 'provide a', 'only output', 'nothing else', 'example output',
+    'feature name', 'product analysis sections', 'product analysis format', 'section product analysis',
+    'section format', 'full product', 'sections (', 'format:', 'output:', 'rules:', 'task:',
+    'important:', 'do not', 'avoid listing', 'focus on', 'group related', 'use clear', 'list features',
+]))
+_COLON_KEYWORD_RE = re.compile(_alternation(['format', 'output', 'example', 'rule', 'task', 'please', 'tell']))
+_PROMPT_WORD_RE = re.compile(_alternation(['please', 'tell', 'what', 'how', 'can', 'could']))
+_QUESTION_START_RE = re.compile(r"(?:what|where|when|why|who|how|which|whose) ")
+
+# Codex feature-list output: a reply opening with one of these is conversational, not a list
+_CONVERSATIONAL_REPLY_RE = re.compile(_alternation([
+    "i'm", "i am", "i see", "i need", "i want", "i have",
+    "you've", "you have", "you're", "you are",
+    "which", "what", "how", "when", "where", "why",
+    "please", "can you", "could you", "would you",
+    "let me", "allow me", "excuse me",
+]))
+# Discovered features are committed in batches of this size so a crash keeps finished analyses
+_COMMIT_BATCH_SIZE = 5
+
+# One section-body line: optional bullet marker run, then the item text (whitespace trimmed, newlines excluded)
+_LIST_LINE_RE = re.compile(r"^[^\S\n]*(?P<bullet>[-*•]+)?[^\S\n]*(?P<text>.*?)[^\S\n]*$", re.MULTILINE)
+# Numbered list item on a stripped line; a non-empty "gap" group is required for the first item
+_NUMBERED_ITEM_RE = re.compile(r"^\d+\.(?P<gap>\s*)(?P<name>.+)$")
+
+
+def _split_sections(text: str) -> Dict[str, str]:
+    """
+    Split markdown into {heading: body} in one pass over its "##" markers.
+    
+    Args:
+        text: Markdown text with "## Heading" sections
+        
+    Returns:
+        Section bodies keyed by heading text (first occurrence wins)
+    """
+    sections: Dict[str, str] = {}
+    for chunk in text.split("##")[1:]:
+        heading, _, body = chunk.partition("\n")
+        sections.setdefault(heading.strip().rstrip(":").strip(), body.strip())
+    return sections
+
+
+def _list_items(text: str) -> List[str]:
+    """
+    Items of a section body: bullet text with the marker removed, plus any other non-heading lines.
+    
+    Args:
+        text: Section body
+        
+    Returns:
+        List of items in order
+    """
+    items = []
+    for match in _LIST_LINE_RE.finditer(text):
+        item = match.group("text")
+        # Bullet items are always kept; bare lines are skipped if they are headings
+        if item and (match.group("bullet") or not item.startswith('#')):
+            items.append(item)
+    return items
+
+
 class FeatureDiscoveryService:
     """Service for discovering and analyzing features in a codebase"""
     
-    def __init__(self):
-        self.gemini_client = GeminiClient()
-        self.feature_analysis_node = create_feature_analysis_node()
+    @functools.cached_property
+    def gemini_client(self) -> GeminiClient:
+        """Shared Gemini client, resolved on first use."""
+        return get_gemini_client()
+    
+    @functools.cached_property
+    def feature_analysis_node(self):
+        """Feature analysis node, built on first use."""
+        return create_feature_analysis_node()
     
     def discover_features_from_codebase(
         self,
@@ -71,51 +158,11 @@ class FeatureDiscoveryService:
                 logger.warning(f"No features discovered for project {project_id}")
                 return []
             
-            # Step 2: For each feature, run detailed analysis using feature_analysis_node
-            discovered_features = []
-            for feature_name in feature_list:
-                try:
-                    logger.info(f"Analyzing feature: {feature_name}")
-                    feature_analysis = self._analyze_feature(feature_name, repo_path)
-                    
-                    # Parse the analysis to extract required fields
-                    parsed_feature = self._parse_feature_analysis(feature_name, feature_analysis)
-                    
-                    # Create chat session for this feature
-                    chat = Chat(
-                        project_id=project_id,
-                        recipe_id=None,  # Kept for backward compatibility only
-                        analysis_type="project_feature",
-                        analysis_context=feature_analysis.get("feature_details", ""),
-                        conversation_history="[]"
-                    )
-                    db.add(chat)
-                    db.flush()
-                    
-                    # Create ProjectFeature
-                    project_feature = ProjectFeature(
-                        project_id=project_id,
-                        chat_id=chat.id,
-                        feature_name=parsed_feature["feature_name"],
-                        high_level_overview=parsed_feature["high_level_overview"],
-                        scope=parsed_feature["scope"],
-                        dependencies=parsed_feature["dependencies"],
-                        key_considerations=parsed_feature["key_considerations"],
-                        limitations=parsed_feature["limitations"],
-                        discovery_timestamp=datetime.utcnow()
-                    )
-                    db.add(project_feature)
-                    discovered_features.append(project_feature)
-                    
-                except Exception as e:
-                    logger.error(f"Error analyzing feature {feature_name}: {str(e)}", exc_info=True)
-                    continue
-            
-            db.commit()
-            
-            # Refresh all features to get IDs
-            for feature in discovered_features:
-                db.refresh(feature)
+            # Step 2: Analyze the features concurrently (Codex + LLM) on one event loop;
+            # rows are created in discovery order as each result arrives
+            discovered_features = asyncio.run(
+                self._analyze_and_store_features(project_id, feature_list, repo_path, db)
+            )
             
             logger.info(f"Successfully discovered {len(discovered_features)} features for project {project_id}")
             return discovered_features
@@ -125,6 +172,75 @@ class FeatureDiscoveryService:
             db.rollback()
             raise
     
+    async def _analyze_and_store_features(
+        self,
+        project_id: str,
+        feature_list: List[str],
+        repo_path: str,
+        db: Session
+    ) -> List[ProjectFeature]:
+        """
+        Analyze features concurrently and store each one as its analysis finishes.
+        
+        Args:
+            project_id: Project identifier
+            feature_list: Feature names, in discovery order
+            repo_path: Path to the repository
+            db: Database session (used only between awaits, on the calling thread)
+            
+        Returns:
+            List of created ProjectFeature objects
+        """
+        semaphore = asyncio.Semaphore(max(1, FEATURE_DISCOVERY_CONCURRENCY))
+        
+        async def analyze(feature_name: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._analyze_feature(feature_name, repo_path)
+        
+        tasks = [asyncio.ensure_future(analyze(feature_name)) for feature_name in feature_list]
+        discovered_features = []
+        for feature_name, task in zip(feature_list, tasks):
+            try:
+                feature_analysis = await task
+                
+                # Parse the analysis to extract required fields
+                parsed_feature = self._parse_feature_analysis(feature_name, feature_analysis)
+                
+                # Create chat session for this feature
+                chat = Chat(
+                    project_id=project_id,
+                    analysis_type="project_feature",
+                    analysis_context=feature_analysis.get("feature_details", ""),
+                    conversation_history=[]
+                )
+                
+                # Create ProjectFeature; linking via the relationship lets each flush batch the inserts
+                project_feature = ProjectFeature(
+                    project_id=project_id,
+                    chat=chat,
+                    feature_name=parsed_feature["feature_name"],
+                    high_level_overview=parsed_feature["high_level_overview"],
+                    scope=parsed_feature["scope"],
+                    dependencies=parsed_feature["dependencies"],
+                    key_considerations=parsed_feature["key_considerations"],
+                    limitations=parsed_feature["limitations"],
+                    discovery_timestamp=datetime.utcnow()
+                )
+                db.add(project_feature)
+                discovered_features.append(project_feature)
+                
+            except Exception as e:
+                logger.error(f"Error analyzing feature {feature_name}: {str(e)}", exc_info=True)
+                continue
+            
+            # Persist finished analyses as we go; commit errors abort discovery (outer handler)
+            if len(discovered_features) % _COMMIT_BATCH_SIZE == 0:
+                db.commit()
+        
+        # Commit the remainder; each batch's chats and features go out as batched INSERT ... RETURNING
+        db.commit()
+        return discovered_features
+    
     def _discover_feature_list(self, repo_path: str) -> List[str]:
         """
         Run Codex to discover all features in the codebase.
@@ -191,7 +307,14 @@ Which output do you want...
 2. A 10‑section product analysis format
 """
         
-        codex_output = run_codex_raw_prompt(repo_path, prompt)
+        # Same repo HEAD + prompt => same capability list; per-feature analyses are cached by the runner
+        cache_file = codex_cache_file(repo_path, prompt)
+        cached_output = get_cached_analysis(cache_file)
+        if cached_output is not None:
+            logger.info(f"Using cached Codex feature list for {repo_path}")
+            codex_output = cached_output
+        else:
+            codex_output = run_codex_raw_prompt(repo_path, prompt)
         
         if not codex_output:
             logger.warning("Codex returned empty output for feature discovery")
@@ -200,42 +323,25 @@ Which output do you want...
         logger.info(f"Codex output for feature discovery: {codex_output}")
         
         # Check if output is conversational/question - if so, reject it
-        conversational_starters = [
-            "i'm", "i am", "i see", "i need", "i want", "i have",
-            "you've", "you have", "you're", "you are",
-            "which", "what", "how", "when", "where", "why",
-            "please", "can you", "could you", "would you",
-            "let me", "allow me", "excuse me",
-        ]
-        
-        first_line_lower = codex_output.split('\n')[0].strip().lower()
-        if any(first_line_lower.startswith(starter) for starter in conversational_starters):
+        first_line_lower = codex_output.partition('\n')[0].strip().lower()
+        if _CONVERSATIONAL_REPLY_RE.match(first_line_lower):
             logger.warning("Codex returned conversational response instead of feature list. Rejecting output.")
             return []
         
-        # Find the start of the numbered list - skip any conversational text before it
-        lines = codex_output.split('\n')
-        numbered_list_start = None
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
-            # Look for the first numbered list item (must be at start of line)
-            if re.match(r'^\d+\.\s+.+', line_stripped):
-                numbered_list_start = i
-                break
-        
-        # If no numbered list found, return empty (don't try to parse conversational text)
-        if numbered_list_start is None:
-            logger.warning("No numbered list found in Codex output. Output may be conversational.")
-            return []
-        
-        # Parse only from the numbered list onwards
+        # Single pass: skip any conversational text before the numbered list, then parse it
         feature_names = []
-        for line in lines[numbered_list_start:]:
+        in_list = False
+        for line in codex_output.split('\n'):
             line = line.strip()
             # Match numbered list items (1. Feature Name, 2. Feature Name, etc.)
-            match = re.match(r'^\d+\.\s*(.+)$', line)
+            match = _NUMBERED_ITEM_RE.match(line)
+            if not in_list:
+                # The list starts at the first "N. Name" item (must be at start of line)
+                if not match or not match.group("gap"):
+                    continue
+                in_list = True
             if match:
-                feature_name = match.group(1).strip()
+                feature_name = match.group("name").strip()
                 if feature_name and self._is_valid_feature_name(feature_name):
                     feature_names.append(feature_name)
             # Stop parsing if we hit a non-numbered line after finding features
@@ -243,10 +349,20 @@ Which output do you want...
                 # If we've found features and hit a non-numbered line, we're done
                 break
         
+        # If no numbered list found, return empty (don't try to parse conversational text)
+        if not in_list:
+            logger.warning("No numbered list found in Codex output. Output may be conversational.")
+            return []
+        
         logger.info(f"Discovered {len(feature_names)} features: {feature_names}")
+        # Only cache output that parsed into a usable list, so a bad Codex answer is retried next time
+        if feature_names and cached_output is None:
+            set_cached_analysis(cache_file, codex_output)
         return feature_names[:50]  # Limit to 50 features to avoid overwhelming the system
     
-    def _is_valid_feature_name(self, name: str) -> bool:
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def _is_valid_feature_name(name: str) -> bool:
         """
         Validate that a feature name is actually a feature, not instruction text.
         
@@ -259,104 +375,43 @@ Which output do you want...
         if not name or len(name) < 3:
             return False
         
-        name_lower = name.lower().strip()
+        # Strip and lowercase once; every check below reads these locals
+        name_stripped = name.strip()
+        name_lower = name_stripped.lower()
         
         # Filter out conversational/prompt-like text
-        conversational_patterns = [
-            'please tell me',
-            'please',
-            'tell me',
-            'what is',
-            'what are',
-            'can you',
-            'could you',
-            'would you',
-            'how do',
-            'how does',
-            'i need',
-            'i want',
-            'show me',
-            'give me',
-            'help me',
-        ]
-        
-        # Check if name starts with conversational patterns
-        for pattern in conversational_patterns:
-            if name_lower.startswith(pattern):
-                return False
+        if _CONVERSATIONAL_PREFIX_RE.match(name_lower):
+            return False
         
         # Filter out status messages and instruction-like text
-        status_message_patterns = [
-            'no user-facing features',
-            'no features detected',
-            'no features found',
-            'no feature',
-            'features not found',
-            'no capabilities',
-            'unable to find',
-            'cannot find',
-        ]
-        
-        # Check if name is a status message
-        for pattern in status_message_patterns:
-            if pattern in name_lower:
-                return False
+        if _STATUS_MESSAGE_RE.search(name_lower):
+            return False
         
         # Filter out quoted text (likely choices or options, not features)
-        if (name.strip().startswith('"') and name.strip().endswith('"')) or \
-           (name.strip().startswith("'") and name.strip().endswith("'")):
+        if name_stripped[:1] in ('"', "'") and name_stripped.endswith(name_stripped[0]):
             return False
         
         # Filter out instruction-like text
-        instruction_patterns = [
-            'numbered list',
-            'output format',
-            'provide a',
-            'only output',
-            'nothing else',
-            'example output',
-            'feature name',
-            'product analysis sections',
-            'product analysis format',
-            'section product analysis',
-            'section format',
-            'full product',
-            'sections (',
-            'format:',
-            'output:',
-            'rules:',
-            'task:',
-            'important:',
-            'do not',
-            'avoid listing',
-            'focus on',
-            'group related',
-            'use clear',
-            'list features',
-        ]
-        
-        # Check if name contains instruction patterns
-        for pattern in instruction_patterns:
-            if pattern in name_lower:
-                return False
+        if _INSTRUCTION_RE.search(name_lower):
+            return False
         
         # Filter out format descriptions (contains both "section"/"analysis" and "format")
         if ('section' in name_lower or 'analysis' in name_lower) and 'format' in name_lower:
             return False
         
         # Filter out questions (ending with ?)
-        if name.strip().endswith('?'):
+        if name_stripped.endswith('?'):
             return False
         
         # Filter out lines that are clearly instructions (contain colons with specific keywords)
-        if ':' in name and any(keyword in name_lower for keyword in ['format', 'output', 'example', 'rule', 'task', 'please', 'tell']):
+        if ':' in name and _COLON_KEYWORD_RE.search(name_lower):
             return False
         
         # Filter out very short phrases that end with colon (likely prompts)
-        if name.strip().endswith(':') and len(name.strip()) < 30:
+        if name_stripped.endswith(':') and len(name_stripped) < 30:
             # Allow colons if it's a reasonable feature name (like "User Management: Admin Panel")
             # But reject if it's too short or looks like a prompt
-            if len(name.strip()) < 15 or any(word in name_lower for word in ['please', 'tell', 'what', 'how', 'can', 'could']):
+            if len(name_stripped) < 15 or _PROMPT_WORD_RE.search(name_lower):
                 return False
         
         # Filter out lines that look like template placeholders
@@ -369,13 +424,12 @@ Which output do you want...
         
         # Feature names should be noun phrases, not questions or commands
         # Reject if it starts with question words or imperative verbs
-        question_starters = ['what', 'where', 'when', 'why', 'who', 'how', 'which', 'whose']
-        if any(name_lower.startswith(q + ' ') for q in question_starters):
+        if _QUESTION_START_RE.match(name_lower):
             return False
         
         return True
     
-    def _analyze_feature(self, feature_name: str, repo_path: str) -> Dict[str, Any]:
+    async def _analyze_feature(self, feature_name: str, repo_path: str) -> Dict[str, Any]:
         """
         Analyze a single feature using feature_analysis_node.
         
@@ -386,17 +440,17 @@ Which output do you want...
         Returns:
             Dictionary with high_level_design and feature_details
         """
+        logger.info(f"Analyzing feature: {feature_name}")
+        
         # Run Codex analysis for this specific feature
         query = f"Analyze the '{feature_name}' feature in this codebase. Provide a comprehensive analysis of what this feature does, its scope, dependencies, considerations, and limitations."
-        codex_analysis = run_codex_in_terminal(repo_path, query)
+        codex_analysis = await run_codex_in_terminal_async(repo_path, query)
         
         # Create state for feature_analysis_node
         state: FeatureAnalysisState = {
             "project_id": "",  # Not needed for analysis
-            "recipe_id": None,  # No recipe needed - now optional
             "query": query,
             "repo_path": repo_path,
-            "codebase_structure": {},
             "codex_analysis": codex_analysis,
             "high_level_design": "",
             "feature_details": "",
@@ -404,7 +458,7 @@ Which output do you want...
         }
         
         # Run feature analysis node
-        result = self.feature_analysis_node(state)
+        result = await self.feature_analysis_node(state)
         
         return {
             "high_level_design": result.get("high_level_design", ""),
@@ -425,71 +479,23 @@ Which output do you want...
         feature_details = analysis.get("feature_details", "")
         high_level_design = analysis.get("high_level_design", "")
         
-        # Extract sections from feature_details
-        def _extract_section(text: str, heading: str) -> str:
-            if heading not in text:
-                return ""
-            parts = text.split(heading, 1)
-            if len(parts) > 1:
-                # Get content until next ## heading
-                content = parts[1].split("##", 1)[0].strip()
-                return content
-            return ""
+        # Split feature_details into its "## " sections once, then look each one up
+        sections = _split_sections(feature_details)
         
         # Extract overview (from high_level_design or Feature Overview section)
         overview = high_level_design
         if not overview:
-            overview = _extract_section(feature_details, "## Feature Overview")
+            overview = sections.get("Feature Overview", "")
         
         # Extract scope (from Key Capabilities or Product Integration)
-        scope_parts = []
-        capabilities = _extract_section(feature_details, "## Key Capabilities")
-        if capabilities:
-            scope_parts.append(capabilities)
-        integration = _extract_section(feature_details, "## Product Integration")
-        if integration:
-            scope_parts.append(integration)
+        scope_parts = [
+            part for part in (sections.get("Key Capabilities"), sections.get("Product Integration")) if part
+        ]
         scope = "\n\n".join(scope_parts) if scope_parts else overview
         
-        # Extract dependencies
-        dependencies_text = _extract_section(feature_details, "## Dependencies")
-        dependencies = []
-        if dependencies_text:
-            # Parse bullet points or list items
-            for line in dependencies_text.split('\n'):
-                line = line.strip()
-                if line and (line.startswith('-') or line.startswith('*') or line.startswith('•')):
-                    dep = line.lstrip('-*•').strip()
-                    if dep:
-                        dependencies.append(dep)
-                elif line and not line.startswith('#'):
-                    dependencies.append(line)
-        
-        # Extract considerations
-        considerations_text = _extract_section(feature_details, "## Considerations")
-        considerations = []
-        if considerations_text:
-            for line in considerations_text.split('\n'):
-                line = line.strip()
-                if line and (line.startswith('-') or line.startswith('*') or line.startswith('•')):
-                    cons = line.lstrip('-*•').strip()
-                    if cons:
-                        considerations.append(cons)
-                elif line and not line.startswith('#'):
-                    considerations.append(line)
-        
-        # Extract limitations (look for limitations section or infer from considerations)
-        limitations_text = _extract_section(feature_details, "## Limitations")
-        limitations = []
-        if limitations_text:
-            for line in limitations_text.split('\n'):
-                line = line.strip()
-                if line and (line.startswith('-') or line.startswith('*') or line.startswith('•')):
-                    lim = line.lstrip('-*•').strip()
-                    if lim:
-                        limitations.append(lim)
-                elif line and not line.startswith('#'):
-                    limitations.append(line)
+        dependencies = _list_items(sections.get("Dependencies", ""))
+        considerations = _list_items(sections.get("Considerations", ""))
+        limitations = _list_items(sections.get("Limitations", ""))
         
         return {
             "feature_name": feature_name,
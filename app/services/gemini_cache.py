@@ -0,0 +1,178 @@
+"""
+Response cache for Gemini calls.
+Stores generated text in SQLite, keyed by a SHA-256 of the system prompt and prompt,
+with a small in-process LRU in front of it for the hottest entries.
+"""
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.config import GEMINI_CACHE_ENABLED, GEMINI_CACHE_PATH, GEMINI_CACHE_TTL_SECONDS
+from app.services.gemini_client import get_gemini_client
+
+logger = logging.getLogger(__name__)
+
+_init_lock = threading.Lock()
+_initialized = False
+
+# In-process LRU (cache_key -> (response, created_at)) checked before SQLite
+_MEMORY_CACHE_SIZE = 1024
+_memory_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _memory_get(key: str) -> Optional[str]:
+    """Get a fresh entry from the in-process LRU."""
+    with _memory_lock:
+        entry = _memory_cache.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[1] > GEMINI_CACHE_TTL_SECONDS:
+            del _memory_cache[key]
+            return None
+        _memory_cache.move_to_end(key)
+        return entry[0]
+
+
+def _memory_set(key: str, response: str, created_at: float) -> None:
+    """Put an entry in the in-process LRU, evicting the least recently used."""
+    with _memory_lock:
+        _memory_cache[key] = (response, created_at)
+        _memory_cache.move_to_end(key)
+        if len(_memory_cache) > _MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
+def _cache_key(prompt: str, system_prompt: Optional[str]) -> str:
+    """Build the cache key for a prompt pair."""
+    return hashlib.sha256(f"{system_prompt or ''}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+def _connect() -> sqlite3.Connection:
+    """Open a connection to the cache database, creating the table on first use."""
+    global _initialized
+    conn = sqlite3.connect(GEMINI_CACHE_PATH, timeout=5)
+    if not _initialized:
+        with _init_lock:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS gemini_responses ("
+                "cache_key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.commit()
+            _initialized = True
+    return conn
+
+
+def get_cached_response(prompt: str, system_prompt: Optional[str] = None) -> Optional[str]:
+    """
+    Look up a cached response.
+
+    Args:
+        prompt: User prompt
+        system_prompt: Optional system instruction
+
+    Returns:
+        Cached text, or None on miss (or if caching is disabled/unavailable)
+    """
+    if not GEMINI_CACHE_ENABLED:
+        return None
+    key = _cache_key(prompt, system_prompt)
+    response = _memory_get(key)
+    if response is not None:
+        return response
+    try:
+        conn = _connect()
+        try:
+            row = conn.execute(
+                "SELECT response, created_at FROM gemini_responses WHERE cache_key = ?",
+                (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("Gemini cache lookup failed: %s", str(e))
+        return None
+
+    if not row or time.time() - row[1] > GEMINI_CACHE_TTL_SECONDS:
+        return None
+    _memory_set(key, row[0], row[1])
+    return row[0]
+
+
+def set_cached_response(prompt: str, system_prompt: Optional[str], response: str) -> None:
+    """
+    Store a response in the cache.
+
+    Args:
+        prompt: User prompt
+        system_prompt: Optional system instruction
+        response: Generated text to store
+    """
+    if not GEMINI_CACHE_ENABLED or not response:
+        return
+    key = _cache_key(prompt, system_prompt)
+    created_at = time.time()
+    _memory_set(key, response, created_at)
+    try:
+        conn = _connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO gemini_responses (cache_key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, created_at)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("Gemini cache write failed: %s", str(e))
+
+
+# cache_key -> running Gemini call, so concurrent identical prompts await the same task
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+def _forget_inflight(key: str, task: asyncio.Task) -> None:
+    """Drop a finished task from the in-flight map (unless a newer one replaced it)."""
+    if _inflight.get(key) is task:
+        del _inflight[key]
+
+
+async def cached_agenerate(prompt: str, system_prompt: Optional[str] = None) -> str:
+    """
+    Generate content with Gemini, serving identical prompts from the cache.
+
+    Concurrent identical prompts share a single in-flight call.
+
+    Args:
+        prompt: User prompt
+        system_prompt: Optional system instruction
+
+    Returns:
+        Generated text
+    """
+    cached = await asyncio.to_thread(get_cached_response, prompt, system_prompt)
+    if cached is not None:
+        logger.info("Gemini cache hit")
+        return cached
+
+    # Identical prompts already in flight (e.g. a burst of the same routing request) share one call
+    key = _cache_key(prompt, system_prompt)
+    loop = asyncio.get_running_loop()
+    task = _inflight.get(key)
+    if task is not None and task.get_loop() is loop:
+        logger.info("Joining in-flight Gemini request")
+        return await asyncio.shield(task)
+
+    task = loop.create_task(get_gemini_client().agenerate_content(prompt, system_prompt=system_prompt))
+    _inflight[key] = task
+    task.add_done_callback(lambda done, key=key: _forget_inflight(key, done))
+    response = await asyncio.shield(task)
+    await asyncio.to_thread(set_cached_response, prompt, system_prompt, response)
+    return response
+
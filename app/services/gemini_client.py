@@ -3,6 +3,7 @@ Gemini API client for text generation using LangChain.
 Copied from jira-planbot
 """
 
+import functools
 import logging
 from typing import Optional
 
@@ -14,6 +15,16 @@ from app.config import GEMINI_API_KEY, GEMINI_MODEL, GEMINI_FALLBACK_MODEL
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=4)
+def _build_llm(model: str, api_key: str) -> ChatGoogleGenerativeAI:
+    """Chat model for (model, api_key), shared process-wide so every client reuses its HTTP session."""
+    return ChatGoogleGenerativeAI(
+        model=model,
+        google_api_key=api_key,
+        temperature=0.7,
+    )
+
+
 class GeminiClient:
     """Gemini API client using LangChain."""
 
@@ -24,31 +35,26 @@ class GeminiClient:
         
         if not self.api_key:
             raise ValueError("Gemini API not configured. Set GEMINI_API_KEY environment variable.")
-        
-        # Initialize primary model
-        self.llm = ChatGoogleGenerativeAI(
-            model=self.model,
-            google_api_key=self.api_key,
-            temperature=0.7,
-        )
-        
-        # Initialize fallback model if different
-        self.fallback_llm = None
-        if self.fallback_model and self.fallback_model != self.model:
-            self.fallback_llm = ChatGoogleGenerativeAI(
-                model=self.fallback_model,
-                google_api_key=self.api_key,
-                temperature=0.7,
-            )
-
-    def generate_content(self, prompt: str, system_prompt: Optional[str] = None, timeout_s: int = 60) -> str:
+
+    @functools.cached_property
+    def llm(self) -> ChatGoogleGenerativeAI:
+        """Primary model, built on first use."""
+        return _build_llm(self.model, self.api_key)
+
+    @functools.cached_property
+    def fallback_llm(self) -> Optional[ChatGoogleGenerativeAI]:
+        """Fallback model (if different from primary), built on first use."""
+        if not self.fallback_model or self.fallback_model == self.model:
+            return None
+        return _build_llm(self.fallback_model, self.api_key)
+
+    async def agenerate_content(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """
-        Generate content using Gemini API via LangChain.
+        Generate content using Gemini API via LangChain, without blocking the event loop.
 
         Args:
             prompt: User prompt.
             system_prompt: Optional system instruction.
-            timeout_s: HTTP timeout in seconds (not used with LangChain, kept for compatibility).
 
         Returns:
             Generated text.
@@ -59,7 +65,7 @@ class GeminiClient:
         messages.append(HumanMessage(content=prompt))
 
         try:
-            response = self.llm.invoke(messages)
+            response = await self.llm.ainvoke(messages)
             return response.content.strip()
         except Exception as e:
             # Try fallback model if available
@@ -71,15 +77,27 @@ class GeminiClient:
                     str(e),
                 )
                 try:
-                    response = self.fallback_llm.invoke(messages)
+                    response = await self.fallback_llm.ainvoke(messages)
                     return response.content.strip()
                 except Exception as fallback_error:
                     logger.error(
-                        f"Both Gemini models failed: primary ({self.model}) and fallback ({self.fallback_model}). "
-                        f"Fallback error: {str(fallback_error)}",
+                        "Both Gemini models failed: primary (%s) and fallback (%s). Fallback error: %s",
+                        self.model,
+                        self.fallback_model,
+                        str(fallback_error),
                         exc_info=True,
                     )
                     raise
-            logger.error(f"Error calling Gemini API: {str(e)}", exc_info=True)
+            logger.error("Error calling Gemini API: %s", str(e), exc_info=True)
             raise
 
+
+@functools.lru_cache(maxsize=1)
+def get_gemini_client() -> GeminiClient:
+    """
+    Get the process-wide GeminiClient instance.
+
+    Returns:
+        Shared GeminiClient (created on first call)
+    """
+    return GeminiClient()
@@ -4,12 +4,76 @@ Service for Git operations
 
 import os
 import logging
+import subprocess
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 from git import Repo
-from app.config import GIT_REPO_BASE_PATH, GIT_BRANCH
+from app.config import GIT_REPO_BASE_PATH, GIT_BRANCH, GIT_SHALLOW
 
 logger = logging.getLogger(__name__)
 
+# Directories never walked when looking at a checkout's files
+_SKIP_DIRS = frozenset({".git", "__pycache__", "venv", "node_modules", ".venv"})
+
+# Codebase structures keyed by (repo_path, HEAD SHA, with_dirs); a pull moves HEAD, so stale entries are never hit
+_structure_cache: Dict[Tuple[str, str, bool], dict] = {}
+_STRUCTURE_CACHE_SIZE = 32
+
+
+def _iter_files(root: str):
+    """Yield paths of all files under root (depth-first via os.scandir), skipping _SKIP_DIRS."""
+    try:
+        with os.scandir(root) as entries:
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir():
+                    if entry.name not in _SKIP_DIRS and not entry.is_symlink():
+                        subdirs.append(entry.path)
+                else:
+                    yield entry.path
+    except OSError:
+        return
+    for subdir in subdirs:
+        yield from _iter_files(subdir)
+
+
+def _walk_tree(root: str, prefix_len: int, files: list, directories: Optional[list]) -> None:
+    """
+    Collect relative file and directory paths under root in os.walk (top-down) order.
+    Relative paths are sliced off the absolute entry path instead of re-parsed with Path.relative_to.
+    Pass directories=None to collect files only.
+    """
+    try:
+        with os.scandir(root) as entries:
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir():
+                    if entry.name not in _SKIP_DIRS:
+                        subdirs.append(entry)
+                else:
+                    files.append(entry.path[prefix_len:])
+    except OSError:
+        return
+    if directories is not None:
+        directories.extend(entry.path[prefix_len:] for entry in subdirs)
+    for entry in subdirs:
+        # Like os.walk, list symlinked directories but do not descend into them
+        if not entry.is_symlink():
+            _walk_tree(entry.path, prefix_len, files, directories)
+
+
+def get_repo_head(repo_path: str) -> Optional[str]:
+    """HEAD commit SHA of repo_path, or None if it cannot be resolved."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", repo_path, "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=False, timeout=10
+        )
+    except Exception as e:
+        logger.warning("Could not resolve git HEAD for %s: %s", repo_path, str(e))
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
 
 class GitService:
     """Service for Git repository operations"""
@@ -17,6 +81,7 @@ class GitService:
     def __init__(self):
         self.repo_base_path = Path(GIT_REPO_BASE_PATH)
         self.branch = GIT_BRANCH
+        self.shallow = GIT_SHALLOW
         # Create base directory if it doesn't exist
         self.repo_base_path.mkdir(parents=True, exist_ok=True)
     
@@ -38,30 +103,45 @@ class GitService:
             
             # Check if repository already exists
             if (repo_path / ".git").exists():
-                logger.info(f"Repository exists at {repo_path}, pulling latest changes...")
+                logger.info(f"Repository exists at {repo_path}, fetching latest changes...")
                 repo = Repo(repo_path)
                 origin = repo.remotes.origin
-                origin.pull(self.branch)
-                logger.info(f"Successfully pulled latest changes from {self.branch}")
+                if self.shallow:
+                    origin.fetch(self.branch, depth=1)
+                else:
+                    origin.fetch(self.branch)
+                remote_ref = f"origin/{self.branch}"
+                # Checkouts are read-only mirrors: skip the merge when nothing changed, otherwise hard-reset
+                if repo.head.commit.hexsha == repo.refs[remote_ref].commit.hexsha:
+                    logger.info(f"Repository already up to date with {remote_ref}")
+                else:
+                    repo.git.reset("--hard", remote_ref)
+                    logger.info(f"Successfully updated repository to {remote_ref}")
             else:
                 if not github_repo:
                     raise ValueError("GitHub repository URL is required.")
                 
                 logger.info(f"Cloning repository from {github_repo} to {repo_path}...")
-                repo = Repo.clone_from(github_repo, repo_path, branch=self.branch)
+                if self.shallow:
+                    repo = Repo.clone_from(
+                        github_repo, repo_path, branch=self.branch, depth=1, multi_options=["--single-branch"]
+                    )
+                else:
+                    repo = Repo.clone_from(github_repo, repo_path, branch=self.branch)
                 logger.info(f"Successfully cloned repository to {repo_path}")
 
-            self._ensure_repo_is_usable(repo_path)
+            self._ensure_repo_is_usable(repo_path, repo)
             return str(repo_path)
             
         except Exception as e:
             logger.error(f"Error cloning/pulling Git repository: {str(e)}", exc_info=True)
             raise
 
-    def _ensure_repo_is_usable(self, repo_path: Path) -> None:
+    def _ensure_repo_is_usable(self, repo_path: Path, repo: Optional[Repo] = None) -> None:
         """
         Validate that the repo path is a usable Git checkout with files.
         Raises an error if the repo is missing core git metadata or has no files.
+        Pass the Repo already opened for repo_path to skip loading it again.
         """
         git_dir = repo_path / ".git"
         if not git_dir.exists():
@@ -71,26 +151,21 @@ class GitService:
             raise ValueError(f"Repo at {repo_path} has incomplete git metadata.")
 
         # Verify GitPython can load it
-        Repo(repo_path)
-
-        # Ensure there are actual files besides .git
-        has_files = False
-        for root, dirs, files in os.walk(repo_path):
-            # Skip .git and common noise
-            dirs[:] = [d for d in dirs if d not in [".git", "__pycache__", "venv", "node_modules", ".venv"]]
-            if files:
-                has_files = True
-                break
-
-        if not has_files:
+        if repo is None:
+            Repo(repo_path)
+
+        # Ensure there are actual files besides .git (stops at the first one found)
+        if next(_iter_files(str(repo_path)), None) is None:
             raise ValueError(f"Repo at {repo_path} contains no files to analyze.")
     
-    def get_codebase_structure(self, repo_path: str) -> dict:
+    def get_codebase_structure(self, repo_path: str, with_dirs: bool = False) -> dict:
         """
         Get the structure of the codebase.
+        Cached per (repo_path, HEAD commit); callers must treat the result as read-only.
         
         Args:
             repo_path: Path to the repository
+            with_dirs: Also list directories (left empty otherwise)
             
         Returns:
             Dictionary containing codebase structure information
@@ -108,21 +183,21 @@ class GitService:
                 logger.warning(f"Repository path does not exist: {repo_path}")
                 return codebase_info
             
+            git_head = get_repo_head(repo_path)
+            cache_key = (repo_path, git_head, with_dirs)
+            if git_head and cache_key in _structure_cache:
+                return _structure_cache[cache_key]
+            
             # Walk through the repository and collect file information
-            for root, dirs, files in os.walk(repo_path_obj):
-                # Skip common directories
-                dirs[:] = [d for d in dirs if d not in [".git", "__pycache__", "venv", "node_modules", ".venv"]]
-                
-                for file in files:
-                    file_path = Path(root) / file
-                    relative_path = file_path.relative_to(repo_path_obj)
-                    codebase_info["files"].append(str(relative_path))
-                
-                for dir_name in dirs:
-                    dir_path = Path(root) / dir_name
-                    relative_path = dir_path.relative_to(repo_path_obj)
-                    codebase_info["directories"].append(str(relative_path))
+            root = str(repo_path_obj)
+            _walk_tree(
+                root, len(root) + 1, codebase_info["files"], codebase_info["directories"] if with_dirs else None
+            )
             
+            if git_head:
+                if len(_structure_cache) >= _STRUCTURE_CACHE_SIZE:
+                    _structure_cache.clear()
+                _structure_cache[cache_key] = codebase_info
             return codebase_info
             
         except Exception as e:
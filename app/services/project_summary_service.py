@@ -3,25 +3,62 @@ Project Summary Service
 Generates project summary, purpose, and tech stack from codebase analysis
 """
 
+import asyncio
 import logging
+import os
+import re
+from itertools import islice
 from typing import Dict, Any, Optional
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from app.models.db_models import Project
-from app.services.gemini_client import GeminiClient
+from app.services.gemini_client import get_gemini_client
+from app.services.gemini_cache import cached_agenerate
 from app.services.git_service import GitService
-from app.langgraph.tools.codex_terminal_runner import run_codex_raw_prompt
+from app.langgraph.tools.codex_cache import codex_cache_file, get_cached_analysis, set_cached_analysis
+from app.langgraph.tools.codex_terminal_runner import run_codex_raw_prompt_async
+from app.config import SUMMARY_SKIP_CODEX_WITH_README, SUMMARY_README_MIN_CHARS
 
 logger = logging.getLogger(__name__)
+git_service = GitService()
+
+# Common key files to check (matched against each file's base name)
+KEY_FILE_PATTERNS = frozenset({
+    "package.json",
+    "requirements.txt",
+    "pyproject.toml",
+    "Pipfile",
+    "go.mod",
+    "Cargo.toml",
+    "pom.xml",
+    "build.gradle",
+    "README.md",
+    "README.rst",
+    "README.txt",
+    ".gitignore",
+    "Dockerfile",
+    "docker-compose.yml",
+    "Makefile",
+})
+
+# "## <heading>" plus its body up to the next "##"; one scan collects every summary section
+_SUMMARY_SECTION_RE = re.compile(r"## (Project Summary|Project Purpose|Tech Stack)(.*?)(?=##|\Z)", re.DOTALL)
+# Body of a README entry in the collected key-files text (entries are joined with "\n---\n")
+_README_ENTRY_RE = re.compile(r"^File: (?:[^\n]*/)?README\.(?:md|rst|txt)\n(.*?)(?=\n---\nFile: |\Z)", re.DOTALL | re.MULTILINE)
+_WHITESPACE_RE = re.compile(r"\s+")
+# One tech-stack line: optional bullet marker run, then the item text (whitespace trimmed, newlines excluded)
+_TECH_LINE_RE = re.compile(r"^[^\S\n]*(?P<bullet>[-*•]+)?[^\S\n]*(?P<text>.*?)[^\S\n]*$", re.MULTILINE)
 
 
 class ProjectSummaryService:
     """Service for generating project summary, purpose, and tech stack"""
     
     def __init__(self):
-        self.gemini_client = GeminiClient()
-        self.git_service = GitService()
+        self.gemini_client = get_gemini_client()
+        # Shared, stateless collaborators: constructing the service costs nothing per task
+        self.git_service = git_service
     
-    def generate_project_summary(
+    async def generate_project_summary(
         self,
         project_id: str,
         repo_path: str,
@@ -43,17 +80,30 @@ class ProjectSummaryService:
         try:
             logger.info(f"Generating project summary for project {project_id}")
             
-            # Get codebase structure
-            codebase_structure = self.git_service.get_codebase_structure(repo_path)
+            async def collect_structure_and_key_files():
+                # Get codebase structure
+                structure = await asyncio.to_thread(self.git_service.get_codebase_structure, repo_path, with_dirs=True)
+                # Collect key files for analysis (package.json, requirements.txt, README, etc.)
+                key_files = await self._collect_key_files(repo_path, structure)
+                return structure, key_files
             
-            # Collect key files for analysis (package.json, requirements.txt, README, etc.)
-            key_files_info = self._collect_key_files(repo_path, codebase_structure)
-            
-            # Run Codex analysis to get codebase overview
-            codex_analysis = self._analyze_codebase_with_codex(repo_path)
+            if SUMMARY_SKIP_CODEX_WITH_README:
+                # Key files first: a substantial README makes the (slow) Codex overview unnecessary
+                codebase_structure, key_files_info = await collect_structure_and_key_files()
+                if self._has_substantial_readme(key_files_info):
+                    logger.info(f"README found for project {project_id}; skipping Codex overview")
+                    codex_analysis = ""
+                else:
+                    codex_analysis = await self._analyze_codebase_with_codex(repo_path)
+            else:
+                # Codex (codebase overview) and the file walk/reads are independent, so run them side by side
+                codex_analysis, (codebase_structure, key_files_info) = await asyncio.gather(
+                    self._analyze_codebase_with_codex(repo_path),
+                    collect_structure_and_key_files(),
+                )
             
             # Generate summary, purpose, and tech stack using Gemini
-            summary_result = self._generate_summary_with_gemini(
+            summary_result = await self._generate_summary_with_gemini(
                 codex_analysis=codex_analysis,
                 key_files_info=key_files_info,
                 project_name=project_name,
@@ -67,13 +117,18 @@ class ProjectSummaryService:
             
             # Update project in database if db session provided
             if db:
-                project = db.query(Project).filter(Project.project_id == project_id).first()
-                if project:
-                    project.summary = parsed_result.get("summary")
-                    project.purpose = parsed_result.get("purpose")
-                    project.tech_stack = parsed_result.get("tech_stack")
-                    db.commit()
-                    db.refresh(project)
+                # One UPDATE round-trip; nothing reads the row back
+                result = db.execute(
+                    update(Project)
+                    .where(Project.project_id == project_id)
+                    .values(
+                        summary=parsed_result.get("summary"),
+                        purpose=parsed_result.get("purpose"),
+                        tech_stack=parsed_result.get("tech_stack"),
+                    )
+                )
+                db.commit()
+                if result.rowcount:
                     logger.info(f"Updated project {project_id} with summary data")
             
             return parsed_result
@@ -87,7 +142,7 @@ class ProjectSummaryService:
                 "tech_stack": []
             }
     
-    def _collect_key_files(self, repo_path: str, codebase_structure: dict) -> str:
+    async def _collect_key_files(self, repo_path: str, codebase_structure: dict) -> str:
         """
         Collect information from key files like package.json, requirements.txt, README, etc.
         
@@ -98,48 +153,54 @@ class ProjectSummaryService:
         Returns:
             String with key files information
         """
-        from pathlib import Path
-        
         key_files = []
-        repo_path_obj = Path(repo_path)
         
-        # Common key files to check
-        key_file_patterns = [
-            "package.json",
-            "requirements.txt",
-            "pyproject.toml",
-            "Pipfile",
-            "go.mod",
-            "Cargo.toml",
-            "pom.xml",
-            "build.gradle",
-            "README.md",
-            "README.rst",
-            "README.txt",
-            ".gitignore",
-            "Dockerfile",
-            "docker-compose.yml",
-            "Makefile"
-        ]
+        def read_key_file(file_path: str) -> Optional[str]:
+            full_path = os.path.join(repo_path, file_path)
+            try:
+                # One stat (isfile implies exists)
+                if os.path.isfile(full_path):
+                    # Limit content size to avoid token limits; one extra char tells us it was cut
+                    with open(full_path, errors="ignore") as f:
+                        content = f.read(2001)
+                    if len(content) > 2000:
+                        content = content[:2000] + "\n[Truncated...]"
+                    return f"File: {file_path}\n{content}\n"
+            except Exception as e:
+                logger.warning(f"Error reading file {file_path}: {str(e)}")
+            return None
         
+        # Lazily matched, so the file list is only scanned as far as needed
         files = codebase_structure.get("files", [])
-        for file_path in files:
-            file_name = Path(file_path).name
-            if file_name in key_file_patterns:
-                full_path = repo_path_obj / file_path
-                try:
-                    if full_path.exists() and full_path.is_file():
-                        content = full_path.read_text(errors="ignore")
-                        # Limit content size to avoid token limits
-                        if len(content) > 2000:
-                            content = content[:2000] + "\n[Truncated...]"
-                        key_files.append(f"File: {file_path}\n{content}\n")
-                except Exception as e:
-                    logger.warning(f"Error reading file {file_path}: {str(e)}")
+        candidates = (file_path for file_path in files if os.path.basename(file_path) in KEY_FILE_PATTERNS)
         
-        return "\n---\n".join(key_files[:10])  # Limit to 10 files
+        # Read the next batch of candidates concurrently until 10 files (limit) were read
+        while len(key_files) < 10:
+            batch = list(islice(candidates, 10 - len(key_files)))
+            if not batch:
+                break
+            contents = await asyncio.gather(*(asyncio.to_thread(read_key_file, file_path) for file_path in batch))
+            key_files.extend(content for content in contents if content)
+        
+        return "\n---\n".join(key_files)
     
-    def _analyze_codebase_with_codex(self, repo_path: str) -> str:
+    @staticmethod
+    def _has_substantial_readme(key_files_info: str) -> bool:
+        """
+        Check whether the collected key files include a README with enough prose to summarize from.
+        
+        Args:
+            key_files_info: Output of _collect_key_files()
+            
+        Returns:
+            True if a README has at least SUMMARY_README_MIN_CHARS non-whitespace characters
+        """
+        for match in _README_ENTRY_RE.finditer(key_files_info):
+            if len(_WHITESPACE_RE.sub("", match.group(1))) >= SUMMARY_README_MIN_CHARS:
+                return True
+        return False
+    
+    async def _analyze_codebase_with_codex(self, repo_path: str) -> str:
         """
         Analyze codebase using Codex to get an overview from a product manager perspective.
         
@@ -167,10 +228,18 @@ Provide:
 Keep it concise and focused on understanding the project's product purpose and business value.
 """
         
-        codex_output = run_codex_raw_prompt(repo_path, prompt)
+        # Same repo HEAD => same overview; with it the Gemini prompt (and its cached answer) repeat too
+        cache_file = await asyncio.to_thread(codex_cache_file, repo_path, prompt)
+        cached_output = await asyncio.to_thread(get_cached_analysis, cache_file)
+        if cached_output is not None:
+            logger.info(f"Using cached Codex project overview for {repo_path}")
+            return cached_output
+        
+        codex_output = await run_codex_raw_prompt_async(repo_path, prompt)
+        await asyncio.to_thread(set_cached_analysis, cache_file, codex_output)
         return codex_output or ""
     
-    def _generate_summary_with_gemini(
+    async def _generate_summary_with_gemini(
         self,
         codex_analysis: str,
         key_files_info: str,
@@ -261,7 +330,9 @@ Output format (use this structure exactly):
 Write in business-friendly language. Focus on product impact, user experience, and business considerations. 
 Avoid technical jargon, code references, or file names. Be thorough, realistic, and professional."""
         
-        result = self.gemini_client.generate_content(prompt, system_prompt=system_prompt)
+        # The whole summary is needed before parsing, so streaming would not return it any sooner;
+        # the shared in-flight call also collapses concurrent summaries of the same project
+        result = await cached_agenerate(prompt, system_prompt=system_prompt)
         return result
     
     def _parse_summary_result(self, summary_text: str) -> Dict[str, Any]:
@@ -274,32 +345,23 @@ Avoid technical jargon, code references, or file names. Be thorough, realistic,
         Returns:
             Dictionary with summary, purpose, and tech_stack
         """
-        def _extract_section(text: str, heading: str) -> str:
-            """Extract a section from the text by heading."""
-            if heading not in text:
-                return ""
-            parts = text.split(heading, 1)
-            if len(parts) > 1:
-                # Get content until next ## heading
-                content = parts[1].split("##", 1)[0].strip()
-                return content
-            return ""
+        # First occurrence of each heading wins; content runs until the next ## heading
+        sections = {}
+        for match in _SUMMARY_SECTION_RE.finditer(summary_text):
+            sections.setdefault(match.group(1), match.group(2).strip())
         
-        summary = _extract_section(summary_text, "## Project Summary")
-        purpose = _extract_section(summary_text, "## Project Purpose")
-        tech_stack_section = _extract_section(summary_text, "## Tech Stack")
+        summary = sections.get("Project Summary", "")
+        purpose = sections.get("Project Purpose", "")
+        tech_stack_section = sections.get("Tech Stack", "")
         
         # Parse tech stack into list
         tech_stack = []
         if tech_stack_section:
-            for line in tech_stack_section.split('\n'):
-                line = line.strip()
-                if line and (line.startswith('-') or line.startswith('*') or line.startswith('•')):
-                    tech = line.lstrip('-*•').strip()
-                    if tech:
-                        tech_stack.append(tech)
-                elif line and not line.startswith('#') and line:
-                    tech_stack.append(line)
+            for match in _TECH_LINE_RE.finditer(tech_stack_section):
+                tech = match.group("text")
+                # Bullet items are always kept; bare lines are skipped if they are headings
+                if tech and (match.group("bullet") or not tech.startswith('#')):
+                    tech_stack.append(tech)
         
         return {
             "summary": summary or None,
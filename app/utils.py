@@ -2,10 +2,12 @@
 Shared utility functions
 """
 
+import functools
 import logging
 from pathlib import Path
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
+from app.models.database import SessionLocal
 from app.models.db_models import Project
 from app.services.git_service import GitService
 
@@ -13,6 +15,31 @@ logger = logging.getLogger(__name__)
 git_service = GitService()
 
 
+@functools.lru_cache(maxsize=512)
+def get_project_repo_path(project_id: str) -> str:
+    """
+    Look up a project's repo_path, cached per process (projects rarely change).
+    ensure_repo_exists() clears the cache when it rewrites a repo_path.
+    
+    Args:
+        project_id: Project identifier
+        
+    Returns:
+        Stored repository path
+        
+    Raises:
+        LookupError: If the project does not exist (misses are not cached)
+    """
+    db = SessionLocal()
+    try:
+        repo_path = db.query(Project.repo_path).filter(Project.project_id == project_id).scalar()
+    finally:
+        db.close()
+    if repo_path is None:
+        raise LookupError(project_id)
+    return repo_path
+
+
 def ensure_repo_exists(project: Project, db: Session) -> str:
     """
     Ensure the repository exists at the stored repo_path.
@@ -43,6 +70,7 @@ def ensure_repo_exists(project: Project, db: Session) -> str:
                 project.repo_path = repo_path
                 db.commit()
                 db.refresh(project)
+                get_project_repo_path.cache_clear()
             except Exception as e:
                 logger.error(f"Failed to re-clone repository: {str(e)}", exc_info=True)
                 raise HTTPException(
@@ -77,5 +77,8 @@ alembic upgrade head || echo "Migrations completed (or already applied)"
 # This ensures tables exist even if alembic_version table doesn't
 python init_db.py || echo "Database initialization completed (or already exists)"
 
+# Tables were just created/migrated above, so workers can skip create_all on boot
+export DB_CREATE_TABLES_ON_STARTUP="${DB_CREATE_TABLES_ON_STARTUP:-false}"
+
 # Execute the main command
 exec "$@"
@@ -5,29 +5,40 @@ Product Assistant API - Agentic AI integration with Codex Product Assistant
 
 import uvicorn
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 
-from app.config import APP_NAME, APP_VERSION, APP_DESCRIPTION, HOST, PORT
+from app.config import (
+    APP_NAME, APP_VERSION, APP_DESCRIPTION, HOST, PORT, GZIP_MINIMUM_SIZE, DB_CREATE_TABLES_ON_STARTUP
+)
 from app.routers.health_router import router as health_router
 from app.routers.projects_router import router as projects_router
 from app.routers.chat_router import router as chat_router
 from app.models.database import Base, engine
+from app.langgraph.tools.codex_cache import prune_expired as prune_codex_cache
+from app.langgraph.unified_orchestrator import get_orchestrator
 # Import models so SQLAlchemy can discover them
 from app.models import db_models  # noqa: F401
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Create database tables (skipped when init_db.py / Alembic manage the schema)
+if DB_CREATE_TABLES_ON_STARTUP:
+    Base.metadata.create_all(bind=engine)
 
 # Create FastAPI application
 app = FastAPI(
     title=APP_NAME,
     description=APP_DESCRIPTION,
-    version=APP_VERSION
+    version=APP_VERSION,
+    default_response_class=ORJSONResponse
 )
 
+# Feasibility, feature and history payloads are large, repetitive JSON
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
 # Include routers
 app.include_router(health_router)
 app.include_router(projects_router)
@@ -38,12 +49,16 @@ app.include_router(chat_router)
 async def startup_event():
     """Startup event handler"""
     print(f"{APP_NAME} v{APP_VERSION} starting up...")
+    prune_codex_cache()
+    # Build the graph inside the event loop (the async checkpointer binds to it)
+    get_orchestrator()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Shutdown event handler"""
     print(f"{APP_NAME} shutting down...")
+    await get_orchestrator().aclose()
 
 
 if __name__ == "__main__":
@@ -10,8 +10,10 @@ def migrate_add_repo_path():
     """Add repo_path column to projects table"""
     print("Adding repo_path column to projects table...")
     
-    with engine.connect() as conn:
-        try:
+    # One transaction for the whole migration (Postgres DDL is transactional):
+    # commits once on success, rolls everything back on error
+    try:
+        with engine.begin() as conn:
             # Check if column already exists
             check_query = text("""
                 SELECT column_name 
@@ -29,7 +31,6 @@ def migrate_add_repo_path():
                 ADD COLUMN repo_path VARCHAR(1000)
             """)
             conn.execute(alter_query)
-            conn.commit()
             
             print("Successfully added repo_path column!")
             
@@ -41,7 +42,6 @@ def migrate_add_repo_path():
                 WHERE repo_path IS NULL
             """)
             conn.execute(update_query, {"base_path": GIT_REPO_BASE_PATH})
-            conn.commit()
             
             print(f"Updated existing projects with computed repo_path values (using {GIT_REPO_BASE_PATH}).")
             
@@ -51,14 +51,12 @@ def migrate_add_repo_path():
                 ALTER COLUMN repo_path SET NOT NULL
             """)
             conn.execute(alter_not_null_query)
-            conn.commit()
             
             print("Made repo_path column NOT NULL.")
             
-        except Exception as e:
-            conn.rollback()
-            print(f"Error during migration: {str(e)}")
-            raise
+    except Exception as e:
+        print(f"Error during migration: {str(e)}")
+        raise
 
 if __name__ == "__main__":
     migrate_add_repo_path()